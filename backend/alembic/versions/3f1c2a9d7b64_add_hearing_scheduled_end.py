@@ -0,0 +1,47 @@
+"""Add hearing scheduled_end for range-overlap conflict checks
+
+Revision ID: 3f1c2a9d7b64
+Revises: eb4088831027
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b64'
+down_revision: Union[str, Sequence[str], None] = 'eb4088831027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hearings', sa.Column('scheduled_end', sa.DateTime(), nullable=True))
+
+    # Backfill end times for existing hearings
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "UPDATE hearings "
+            "SET scheduled_end = scheduled_date + COALESCE(scheduled_duration_hours, 0) * INTERVAL '1 hour' "
+            "WHERE scheduled_date IS NOT NULL"
+        )
+    else:
+        op.execute(
+            "UPDATE hearings "
+            "SET scheduled_end = datetime(scheduled_date, '+' || CAST(COALESCE(scheduled_duration_hours, 0) * 3600 AS INTEGER) || ' seconds') "
+            "WHERE scheduled_date IS NOT NULL"
+        )
+
+    op.create_index('ix_hearings_courtroom_schedule', 'hearings', ['courtroom_id', 'scheduled_date', 'scheduled_end'], unique=False)
+    op.create_index('ix_hearings_schedule_range', 'hearings', ['scheduled_date', 'scheduled_end'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hearings_schedule_range', table_name='hearings')
+    op.drop_index('ix_hearings_courtroom_schedule', table_name='hearings')
+    op.drop_column('hearings', 'scheduled_end')
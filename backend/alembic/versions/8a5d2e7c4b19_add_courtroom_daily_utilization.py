@@ -0,0 +1,46 @@
+"""Add courtroom_daily_utilization rollup
+
+Revision ID: 8a5d2e7c4b19
+Revises: 3f1c2a9d7b64
+Create Date: 2026-10-17 14:03:52.610447
+
+Populate existing history afterwards with: python utilization.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a5d2e7c4b19'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('courtroom_daily_utilization',
+    sa.Column('courtroom_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('court_id', sa.Integer(), nullable=True),
+    sa.Column('scheduled_hours', sa.Float(), nullable=True),
+    sa.Column('hearing_count', sa.Integer(), nullable=True),
+    sa.Column('dominant_judge_id', sa.Integer(), nullable=True),
+    sa.Column('first_case_id', sa.Integer(), nullable=True),
+    sa.Column('judge_hours', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['courtroom_id'], ['courtrooms.id'], ),
+    sa.ForeignKeyConstraint(['court_id'], ['courts.id'], ),
+    sa.ForeignKeyConstraint(['dominant_judge_id'], ['judges.id'], ),
+    sa.ForeignKeyConstraint(['first_case_id'], ['cases.id'], ),
+    sa.PrimaryKeyConstraint('courtroom_id', 'day')
+    )
+    op.create_index('ix_courtroom_daily_utilization_court_day', 'courtroom_daily_utilization', ['court_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_courtroom_daily_utilization_court_day', table_name='courtroom_daily_utilization')
+    op.drop_table('courtroom_daily_utilization')
@@ -0,0 +1,64 @@
+"""Add judge_workload counters
+
+Revision ID: a7c3e9d15f42
+Revises: f4a8c31e6b07
+Create Date: 2026-10-17 17:26:40.918305
+
+Counters are backfilled here; rebuild them later with: python workload.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d15f42'
+down_revision: Union[str, Sequence[str], None] = 'f4a8c31e6b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = "c.assigned_judge_id = j.id AND c.status IN ('admitted', 'listed', 'hearing', 'reserved')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('judge_workload',
+    sa.Column('judge_id', sa.Integer(), nullable=False),
+    sa.Column('active_cases', sa.Integer(), nullable=True),
+    sa.Column('estimated_hours', sa.Float(), nullable=True),
+    sa.Column('habeas_corpus_cases', sa.Integer(), nullable=True),
+    sa.Column('bail_cases', sa.Integer(), nullable=True),
+    sa.Column('injunction_cases', sa.Integer(), nullable=True),
+    sa.Column('regular_cases', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['judge_id'], ['judges.id'], ),
+    sa.PrimaryKeyConstraint('judge_id')
+    )
+
+    op.execute(f"""
+        INSERT INTO judge_workload (judge_id, active_cases, estimated_hours, habeas_corpus_cases,
+                                    bail_cases, injunction_cases, regular_cases, updated_at)
+        SELECT j.id,
+               COUNT(c.id),
+               COALESCE(SUM(c.estimated_duration_hours), 0),
+               SUM(CASE WHEN c.urgency_level = 'habeas_corpus' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN c.urgency_level = 'bail' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN c.urgency_level = 'injunction' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN c.urgency_level = 'regular' THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM judges j
+        LEFT JOIN cases c ON {ACTIVE}
+        GROUP BY j.id
+    """)
+    # current_workload was never maintained; start it from the same count
+    op.execute("""
+        UPDATE judges SET current_workload = (
+            SELECT active_cases FROM judge_workload w WHERE w.judge_id = judges.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('judge_workload')
@@ -0,0 +1,32 @@
+"""Add keyset pagination indexes for cases and documents
+
+Revision ID: c6e1f04a9d32
+Revises: 8a5d2e7c4b19
+Create Date: 2026-10-17 15:21:08.734190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1f04a9d32'
+down_revision: Union[str, Sequence[str], None] = '8a5d2e7c4b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_cases_filing_date_id', 'cases', ['filing_date', 'id'], unique=False)
+    op.create_index('ix_cases_court_filing_date_id', 'cases', ['court_id', 'filing_date', 'id'], unique=False)
+    op.create_index('ix_documents_case_upload_date_id', 'documents', ['case_id', 'upload_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_case_upload_date_id', table_name='documents')
+    op.drop_index('ix_cases_court_filing_date_id', table_name='cases')
+    op.drop_index('ix_cases_filing_date_id', table_name='cases')
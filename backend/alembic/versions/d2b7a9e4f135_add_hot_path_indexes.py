@@ -0,0 +1,41 @@
+"""Add composite and partial indexes for hot filter paths
+
+Revision ID: d2b7a9e4f135
+Revises: c6e1f04a9d32
+Create Date: 2026-10-17 16:02:44.120873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7a9e4f135'
+down_revision: Union[str, Sequence[str], None] = 'c6e1f04a9d32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_HEARINGS = sa.text("status IN ('scheduled', 'hearing')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hearings_status_schedule', 'hearings', ['status', 'scheduled_date'], unique=False)
+    op.create_index('ix_hearings_active_schedule', 'hearings', ['scheduled_date', 'courtroom_id'], unique=False,
+                    postgresql_where=ACTIVE_HEARINGS, sqlite_where=ACTIVE_HEARINGS)
+    op.create_index('ix_cases_court_status', 'cases', ['court_id', 'status'], unique=False)
+    op.create_index('ix_cases_judge_status', 'cases', ['assigned_judge_id', 'status'], unique=False)
+    op.create_index('ix_documents_case_title_type', 'documents', ['case_id', 'title', 'document_type'], unique=False)
+    op.create_index('ix_case_status_history_case_date', 'case_status_history', ['case_id', 'change_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_case_status_history_case_date', table_name='case_status_history')
+    op.drop_index('ix_documents_case_title_type', table_name='documents')
+    op.drop_index('ix_cases_judge_status', table_name='cases')
+    op.drop_index('ix_cases_court_status', table_name='cases')
+    op.drop_index('ix_hearings_active_schedule', table_name='hearings')
+    op.drop_index('ix_hearings_status_schedule', table_name='hearings')
@@ -0,0 +1,46 @@
+"""Store judge and lawyer specializations as JSONB with GIN indexes
+
+Revision ID: f4a8c31e6b07
+Revises: d2b7a9e4f135
+Create Date: 2026-10-17 16:48:19.502614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c31e6b07'
+down_revision: Union[str, Sequence[str], None] = 'd2b7a9e4f135'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('judges', 'lawyers')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'specializations',
+                        existing_type=sa.JSON(),
+                        type_=postgresql.JSONB(),
+                        postgresql_using='specializations::jsonb')
+        op.create_index(f'ix_{table}_specializations_gin', table, ['specializations'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'specializations': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_specializations_gin', table_name=table)
+        op.alter_column(table, 'specializations',
+                        existing_type=postgresql.JSONB(),
+                        type_=sa.JSON(),
+                        postgresql_using='specializations::json')
@@ -0,0 +1,158 @@
+"""
+Court Hierarchy
+Courts form a tree through parent_court_id (supreme -> high -> district). Queries that
+need "this court and every court under it" filter with a WITH RECURSIVE subtree of
+court ids, so the database walks the tree and nothing is expanded client-side.
+
+The whole tree is also cached in process for the hierarchy views and subtree lookups.
+Court inserts, updates and deletes drop the cache when their transaction commits, and
+it is reloaded after COURT_HIERARCHY_REFRESH_SECONDS to pick up other processes' edits.
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from itertools import chain
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from models import Court
+
+REFRESH_SECONDS = int(os.getenv("COURT_HIERARCHY_REFRESH_SECONDS", "300"))
+
+_COURTS_CHANGED = "court_hierarchy_changed"
+
+
+def subtree_cte(court_id: int):
+    """Recursive CTE of the ids of a court and all its descendants"""
+    subtree = select(Court.id).where(Court.id == court_id).cte("court_subtree", recursive=True)
+    # UNION rather than UNION ALL: a parent cycle ends the recursion instead of looping
+    return subtree.union(select(Court.id).where(Court.parent_court_id == subtree.c.id))
+
+def court_filter(column, court_id: int, include_subcourts: bool = False):
+    """`column` is the court, or with include_subcourts any court in its subtree"""
+    if not include_subcourts:
+        return column == court_id
+    return column.in_(select(subtree_cte(court_id).c.id))
+
+
+class CourtHierarchy:
+    """In-memory court tree: parent and children per court id, plus display fields"""
+
+    def __init__(self, refresh_seconds: int = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._courts: Dict[int, Dict[str, Any]] = {}
+        self._children: Dict[Optional[int], List[int]] = {}
+
+    def ensure_loaded(self, db: Session):
+        """Load the tree on first use and reload it once it is older than refresh_seconds"""
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.refresh_seconds:
+            self.load(db)
+
+    def load(self, db: Session):
+        """Rebuild the tree from the courts table"""
+        rows = db.execute(select(
+            Court.id, Court.name, Court.level, Court.jurisdiction, Court.location,
+            Court.parent_court_id, Court.is_active
+        ).order_by(Court.id)).all()
+
+        courts = {}
+        children = defaultdict(list)
+        for row in rows:
+            courts[row.id] = {
+                "id": row.id,
+                "name": row.name,
+                "level": row.level.value if row.level else None,
+                "jurisdiction": row.jurisdiction.value if row.jurisdiction else None,
+                "location": row.location,
+                "parent_court_id": row.parent_court_id,
+                "is_active": row.is_active
+            }
+        for court_id, court in courts.items():
+            # Courts whose parent is missing are shown as roots
+            parent_id = court["parent_court_id"] if court["parent_court_id"] in courts else None
+            children[parent_id].append(court_id)
+
+        with self._lock:
+            self._courts = courts
+            self._children = dict(children)
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on next use"""
+        with self._lock:
+            self.loaded_at = None
+
+    def courts(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._courts.values())
+
+    def subtree_court_ids(self, court_id: int) -> List[int]:
+        """The court and all its descendants, parents before children; empty if unknown"""
+        with self._lock:
+            if court_id not in self._courts:
+                return []
+            ids = []
+            seen = set()
+            stack = [court_id]
+            while stack:
+                current = stack.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                ids.append(current)
+                stack.extend(reversed(self._children.get(current, [])))
+            return ids
+
+    def tree(self, root_court_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Nested court dicts with "children" lists, from the roots or from one court"""
+        with self._lock:
+            if root_court_id is not None and root_court_id not in self._courts:
+                return []
+            roots = [root_court_id] if root_court_id is not None else self._children.get(None, [])
+            return [self._node(court_id, set()) for court_id in roots]
+
+    def _node(self, court_id: int, path: set) -> Dict[str, Any]:
+        path = path | {court_id}
+        return dict(self._courts[court_id], children=[
+            self._node(child_id, path)
+            for child_id in self._children.get(court_id, [])
+            if child_id not in path
+        ])
+
+
+# Global court hierarchy instance
+court_hierarchy = None
+
+def get_court_hierarchy(db: Optional[Session] = None) -> CourtHierarchy:
+    """
+    Get or create the court hierarchy cache (singleton pattern)
+
+    Args:
+        db: Session used to (re)load the tree when it is missing or stale
+    """
+    global court_hierarchy
+    if court_hierarchy is None:
+        court_hierarchy = CourtHierarchy()
+    if db is not None:
+        court_hierarchy.ensure_loaded(db)
+    return court_hierarchy
+
+@event.listens_for(Session, "after_flush")
+def _collect_court_changes(session: Session, flush_context):
+    if any(isinstance(obj, Court) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_COURTS_CHANGED] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session):
+    if session.info.pop(_COURTS_CHANGED, False) and court_hierarchy is not None:
+        court_hierarchy.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_court_changes(session: Session):
+    session.info.pop(_COURTS_CHANGED, None)
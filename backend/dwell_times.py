@@ -0,0 +1,145 @@
+"""
+Status Dwell Times
+Time cases spend in each status, for every case at once. LEAD() over case_status_history,
+partitioned by case, pairs each status change with the next one; the gap between them
+is one stay in the status that was entered. Stays are then summarized per status (and
+optionally per court and jurisdiction) as mean and p50/p90/p99 in days.
+
+PostgreSQL computes the percentiles with percentile_cont; other databases return the
+stays and NumPy computes the same linear-interpolated percentiles.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import DateTime, and_, func, literal, select
+from sqlalchemy.orm import Session
+
+from models import Case, CaseStatusHistory
+
+PERCENTILES = (50, 90, 99)
+
+# Dimensions stays can be grouped by besides status
+GROUP_COLUMNS = {"court": "court_id", "jurisdiction": "jurisdiction"}
+
+# A case never leaves these, so an open stay in them is not a dwell time
+TERMINAL_STATUSES = ['archived']
+
+
+def _plain(value):
+    return getattr(value, "value", value)
+
+def _stays(court_id: Optional[int], jurisdiction: Optional[str]):
+    """One row per status change with the time of the case's next change (NULL if none yet)"""
+    history = CaseStatusHistory
+    left_at = func.lead(history.change_date).over(
+        partition_by=history.case_id,
+        order_by=(history.change_date, history.id)
+    )
+    query = select(
+        history.new_status.label("status"),
+        Case.court_id,
+        Case.jurisdiction,
+        history.change_date.label("entered_at"),
+        left_at.label("left_at")
+    ).join(Case, Case.id == history.case_id)
+    if court_id:
+        query = query.where(Case.court_id == court_id)
+    if jurisdiction:
+        query = query.where(Case.jurisdiction == jurisdiction)
+    return query.subquery()
+
+def _days_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start) / 86400.0
+    return func.julianday(end) - func.julianday(start)
+
+def dwell_time_stats(
+    db: Session,
+    court_id: Optional[int] = None,
+    jurisdiction: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    group_by: Sequence[str] = ("court", "jurisdiction"),
+    include_open: bool = False
+) -> Dict[str, Any]:
+    """
+    Dwell-time distribution per status
+
+    Args:
+        start_date, end_date: only stays that began in this range
+        group_by: subset of GROUP_COLUMNS to break each status down by
+        include_open: also count stays still in progress, measured up to now
+    """
+    now = datetime.utcnow()
+    stays = _stays(court_id, jurisdiction)
+    left_at = stays.c.left_at
+    if include_open:
+        left_at = func.coalesce(left_at, literal(now, DateTime))
+    days = _days_between(db, stays.c.entered_at, left_at)
+
+    # Filter after the window so LEAD still pairs each change with the case's next one
+    conditions = [stays.c.status.isnot(None)]
+    if include_open:
+        conditions.append(stays.c.left_at.isnot(None) | stays.c.status.notin_(TERMINAL_STATUSES))
+    else:
+        conditions.append(stays.c.left_at.isnot(None))
+    if start_date:
+        conditions.append(stays.c.entered_at >= start_date)
+    if end_date:
+        conditions.append(stays.c.entered_at <= end_date)
+
+    keys = [stays.c.status] + [stays.c[GROUP_COLUMNS[name]] for name in group_by]
+    if db.get_bind().dialect.name == "postgresql":
+        groups = _percentiles_in_sql(db, keys, days, and_(*conditions))
+    else:
+        groups = _percentiles_in_numpy(db, keys, days, and_(*conditions))
+
+    return {
+        "unit": "days",
+        "percentiles": list(PERCENTILES),
+        "group_by": ["status"] + list(group_by),
+        "include_open": include_open,
+        "total_stays": sum(group["stays"] for group in groups),
+        "groups": groups
+    }
+
+def _group(keys, values, stays: int, mean: float, percentiles: Sequence[float]) -> Dict[str, Any]:
+    group = {key.name: _plain(value) for key, value in zip(keys, values)}
+    group["stays"] = stays
+    group["mean_days"] = round(float(mean), 2)
+    for p, value in zip(PERCENTILES, percentiles):
+        group[f"p{p}_days"] = round(float(value), 2)
+    return group
+
+def _percentiles_in_sql(db: Session, keys, days, condition) -> List[Dict[str, Any]]:
+    query = select(
+        *keys,
+        func.count(),
+        func.avg(days),
+        *[func.percentile_cont(p / 100).within_group(days) for p in PERCENTILES]
+    ).where(condition).group_by(*keys).order_by(*keys)
+    n = len(keys)
+    return [
+        _group(keys, row[:n], row[n], row[n + 1], row[n + 2:])
+        for row in db.execute(query)
+    ]
+
+def _percentiles_in_numpy(db: Session, keys, days, condition) -> List[Dict[str, Any]]:
+    rows = db.execute(select(*keys, days).where(condition).order_by(*keys)).all()
+    if not rows:
+        return []
+    n = len(keys)
+    values = np.array([row[n] for row in rows], dtype=float)
+    labels = [tuple(row[:n]) for row in rows]
+    # Rows arrive sorted by group, so each group is one contiguous slice
+    boundaries = [0] + [i for i in range(1, len(labels)) if labels[i] != labels[i - 1]] + [len(labels)]
+    groups = []
+    for begin, end in zip(boundaries, boundaries[1:]):
+        group_values = values[begin:end]
+        groups.append(_group(
+            keys, labels[begin], end - begin, group_values.mean(),
+            np.percentile(group_values, PERCENTILES)
+        ))
+    return groups
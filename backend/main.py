@@ -3,8 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 import uvicorn
-from database import get_db, engine
+from database import get_db, engine, async_engine, get_pool_metrics
 from models import Base
+from pagination import NEXT_CURSOR_HEADER
+from reference_cache import get_reference_cache
 from routers import auth, cases, judges, lawyers, scheduling, calendar, documents, ml_predictions, courts
 import os
 from dotenv import load_dotenv
@@ -27,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -40,6 +43,10 @@ app.include_router(documents.router, prefix="/api/documents", tags=["Documents"]
 app.include_router(ml_predictions.router, prefix="/api/ml", tags=["ML Predictions"])
 app.include_router(courts.router, prefix="/api/courts", tags=["Courts"])
 
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "Courtroom Scheduling API is running"}
@@ -48,5 +55,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Connection pool usage and reference cache counters of this worker process"""
+    return {"database_pools": get_pool_metrics(), "reference_cache": get_reference_cache().stats()}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Text, ForeignKey, Float, JSON, Index, and_, event, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import Enum as SQLEnum
-from datetime import datetime
+from datetime import datetime, timedelta
 import enum
 
 Base = declarative_base()
 
+# JSON list stored as JSONB on Postgres so containment queries can use a GIN index
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
 class UserRole(str, enum.Enum):
     CHIEF_JUSTICE = "chief_justice"
     PRESIDING_JUDGE = "presiding_judge"
@@ -81,7 +85,7 @@ class Judge(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     court_id = Column(Integer, ForeignKey("courts.id"))
-    specializations = Column(JSON)  # List of jurisdictions
+    specializations = Column(JSONList)  # List of jurisdictions
     experience_years = Column(Integer)
     disposal_rate = Column(Float)
     current_workload = Column(Integer, default=0)
@@ -94,6 +98,13 @@ class Judge(Base):
     cases = relationship("Case", back_populates="assigned_judge")
     recusals = relationship("JudgeRecusal", back_populates="judge")
 
+    __table_args__ = (
+        Index(
+            "ix_judges_specializations_gin", "specializations",
+            postgresql_using="gin", postgresql_ops={"specializations": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class Lawyer(Base):
     __tablename__ = "lawyers"
     
@@ -101,7 +112,7 @@ class Lawyer(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     bar_registration = Column(String, unique=True)
     firm_name = Column(String)
-    specializations = Column(JSON)
+    specializations = Column(JSONList)
     win_rate = Column(Float)
     is_available = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -109,6 +120,13 @@ class Lawyer(Base):
     user = relationship("User")
     case_lawyers = relationship("CaseLawyer", back_populates="lawyer")
 
+    __table_args__ = (
+        Index(
+            "ix_lawyers_specializations_gin", "specializations",
+            postgresql_using="gin", postgresql_ops={"specializations": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class Case(Base):
     __tablename__ = "cases"
     
@@ -135,6 +153,14 @@ class Case(Base):
     documents = relationship("Document", back_populates="case")
     status_history = relationship("CaseStatusHistory", back_populates="case")
 
+    # Keyset pagination order, overall and within a court; status filters per court and judge
+    __table_args__ = (
+        Index("ix_cases_filing_date_id", "filing_date", "id"),
+        Index("ix_cases_court_filing_date_id", "court_id", "filing_date", "id"),
+        Index("ix_cases_court_status", "court_id", "status"),
+        Index("ix_cases_judge_status", "assigned_judge_id", "status"),
+    )
+
 class CaseLawyer(Base):
     __tablename__ = "case_lawyers"
     
@@ -167,6 +193,7 @@ class Hearing(Base):
     case_id = Column(Integer, ForeignKey("cases.id"))
     courtroom_id = Column(Integer, ForeignKey("courtrooms.id"))
     scheduled_date = Column(DateTime)
+    scheduled_end = Column(DateTime)  # scheduled_date + scheduled_duration_hours, kept in sync on flush
     scheduled_duration_hours = Column(Float)
     actual_duration_hours = Column(Float)
     status = Column(String)  # scheduled, completed, adjourned, cancelled
@@ -176,6 +203,29 @@ class Hearing(Base):
     
     case = relationship("Case", back_populates="hearings")
     courtroom = relationship("Courtroom", back_populates="hearings")
+    
+    __table_args__ = (
+        Index("ix_hearings_courtroom_schedule", "courtroom_id", "scheduled_date", "scheduled_end"),
+        Index("ix_hearings_schedule_range", "scheduled_date", "scheduled_end"),
+        Index("ix_hearings_status_schedule", "status", "scheduled_date"),
+        # Only scheduled/hearing rows take part in conflict checks and upcoming lists
+        Index(
+            "ix_hearings_active_schedule", "scheduled_date", "courtroom_id",
+            postgresql_where=text("status IN ('scheduled', 'hearing')"),
+            sqlite_where=text("status IN ('scheduled', 'hearing')")
+        ),
+    )
+    
+    @classmethod
+    def overlaps(cls, start: datetime, end: datetime):
+        """SQL predicate for hearings overlapping [start, end)"""
+        return and_(cls.scheduled_date < end, cls.scheduled_end > start)
+
+@event.listens_for(Hearing, "before_insert")
+@event.listens_for(Hearing, "before_update")
+def _set_hearing_scheduled_end(mapper, connection, hearing):
+    if hearing.scheduled_date is not None:
+        hearing.scheduled_end = hearing.scheduled_date + timedelta(hours=hearing.scheduled_duration_hours or 0)
 
 class Document(Base):
     __tablename__ = "documents"
@@ -195,6 +245,12 @@ class Document(Base):
     case = relationship("Case", back_populates="documents")
     uploader = relationship("User")
 
+    # Per-case listing, newest upload first; duplicate-title check on upload
+    __table_args__ = (
+        Index("ix_documents_case_upload_date_id", "case_id", "upload_date", "id"),
+        Index("ix_documents_case_title_type", "case_id", "title", "document_type"),
+    )
+
 class JudgeRecusal(Base):
     __tablename__ = "judge_recusals"
     
@@ -220,6 +276,41 @@ class CaseStatusHistory(Base):
     case = relationship("Case", back_populates="status_history")
     changed_by_user = relationship("User")
 
+    __table_args__ = (
+        Index("ix_case_status_history_case_date", "case_id", "change_date"),
+    )
+
+class CourtroomDailyUtilization(Base):
+    """Per courtroom and day rollup of non-cancelled hearings, maintained by utilization.py"""
+    __tablename__ = "courtroom_daily_utilization"
+    
+    courtroom_id = Column(Integer, ForeignKey("courtrooms.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    court_id = Column(Integer, ForeignKey("courts.id"))
+    scheduled_hours = Column(Float, default=0.0)
+    hearing_count = Column(Integer, default=0)
+    dominant_judge_id = Column(Integer, ForeignKey("judges.id"))  # Judge with the most scheduled hours
+    first_case_id = Column(Integer, ForeignKey("cases.id"))  # Case of the day's earliest hearing
+    judge_hours = Column(JSON)  # {judge_id: scheduled hours}
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_courtroom_daily_utilization_court_day", "court_id", "day"),
+    )
+
+class JudgeWorkload(Base):
+    """Active-case counters per judge, maintained by workload.py"""
+    __tablename__ = "judge_workload"
+    
+    judge_id = Column(Integer, ForeignKey("judges.id"), primary_key=True)
+    active_cases = Column(Integer, default=0)
+    estimated_hours = Column(Float, default=0.0)
+    habeas_corpus_cases = Column(Integer, default=0)
+    bail_cases = Column(Integer, default=0)
+    injunction_cases = Column(Integer, default=0)
+    regular_cases = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # AI/ML Placeholder Models
 class CasePrediction(Base):
     __tablename__ = "case_predictions"
@@ -0,0 +1,264 @@
+"""
+Occupancy Index
+In-process interval index of active hearings keyed by judge, courtroom and lawyer.
+Answers "is [start, end) free?" with a binary search instead of a database range scan.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import Hearing, Case, CaseLawyer
+
+# Hearings in these states occupy their judge, courtroom and lawyers
+ACTIVE_HEARING_STATUSES = ['scheduled', 'hearing']
+
+# Full reloads pick up hearings written by other worker processes
+REFRESH_SECONDS = int(os.getenv("OCCUPANCY_INDEX_REFRESH_SECONDS", "60"))
+
+KINDS = ('judge', 'courtroom', 'lawyer')
+
+
+class IntervalList:
+    """
+    Sorted array of (start, end, hearing_id) entries with a running maximum of end times.
+    The running maximum lets a lookup stop as soon as no earlier entry can reach the query start.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[datetime, datetime, int]] = []
+        self.max_ends: List[datetime] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, start: datetime, end: datetime, hearing_id: int):
+        entry = (start, end, hearing_id)
+        pos = bisect_left(self.entries, entry)
+        self.entries.insert(pos, entry)
+        self._rebuild_max_ends(pos)
+
+    def remove(self, start: datetime, end: datetime, hearing_id: int):
+        entry = (start, end, hearing_id)
+        pos = bisect_left(self.entries, entry)
+        if pos < len(self.entries) and self.entries[pos] == entry:
+            del self.entries[pos]
+            self._rebuild_max_ends(pos)
+
+    def _rebuild_max_ends(self, pos: int):
+        del self.max_ends[pos:]
+        running = self.max_ends[pos - 1] if pos else None
+        for _, end, _ in self.entries[pos:]:
+            if running is None or end > running:
+                running = end
+            self.max_ends.append(running)
+
+    def overlapping(self, start: datetime, end: datetime, exclude_hearing_id: Optional[int] = None) -> List[int]:
+        """Return ids of hearings overlapping [start, end)"""
+        # Entries at or after `idx` start at or after `end` and cannot overlap
+        idx = bisect_left(self.entries, (end,))
+        hearing_ids = []
+        i = idx - 1
+        while i >= 0 and self.max_ends[i] > start:
+            entry_start, entry_end, hearing_id = self.entries[i]
+            if entry_end > start and hearing_id != exclude_hearing_id:
+                hearing_ids.append(hearing_id)
+            i -= 1
+        hearing_ids.reverse()
+        return hearing_ids
+
+    def is_free(self, start: datetime, end: datetime, exclude_hearing_id: Optional[int] = None) -> bool:
+        """Check whether [start, end) overlaps no hearing"""
+        idx = bisect_left(self.entries, (end,))
+        if idx == 0 or self.max_ends[idx - 1] <= start:
+            return True
+        return not self.overlapping(start, end, exclude_hearing_id)
+
+
+class OccupancyIndex:
+    """
+    Occupancy of judges, courtrooms and lawyers built from active hearings.
+    Loaded from the database in two queries and kept current by the hearing write endpoints.
+    """
+
+    def __init__(self, refresh_seconds: int = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._intervals: Dict[str, Dict[int, IntervalList]] = {kind: {} for kind in KINDS}
+        # hearing_id -> (start, end, case_id, judge_id, courtroom_id, lawyer_ids)
+        self._hearings: Dict[int, Tuple[datetime, datetime, int, Optional[int], int, Tuple[int, ...]]] = {}
+        self._case_hearings: Dict[int, Set[int]] = defaultdict(set)
+        self._case_lawyers: Dict[int, Tuple[int, ...]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def ensure_loaded(self, db: Session):
+        """Load the index on first use and reload it once it is older than refresh_seconds"""
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.refresh_seconds:
+            self.load(db)
+
+    def load(self, db: Session):
+        """Rebuild the index from the database"""
+        # Hearings that have already ended are not indexed
+        now = datetime.now()
+
+        hearings = db.query(
+            Hearing.id,
+            Hearing.case_id,
+            Hearing.courtroom_id,
+            Hearing.scheduled_date,
+            Hearing.scheduled_end,
+            Case.assigned_judge_id
+        ).join(Case).filter(
+            Hearing.status.in_(ACTIVE_HEARING_STATUSES),
+            Hearing.scheduled_end > now
+        ).all()
+
+        case_lawyers = defaultdict(list)
+        lawyer_rows = db.query(CaseLawyer.case_id, CaseLawyer.lawyer_id).join(
+            Hearing, Hearing.case_id == CaseLawyer.case_id
+        ).filter(
+            Hearing.status.in_(ACTIVE_HEARING_STATUSES),
+            Hearing.scheduled_end > now
+        ).distinct().all()
+        for case_id, lawyer_id in lawyer_rows:
+            case_lawyers[case_id].append(lawyer_id)
+
+        with self._lock:
+            self._reset()
+            self._case_lawyers = {case_id: tuple(ids) for case_id, ids in case_lawyers.items()}
+            for hearing_id, case_id, courtroom_id, start, end, judge_id in hearings:
+                self._add(hearing_id, case_id, judge_id, courtroom_id, self._case_lawyers.get(case_id, ()), start, end)
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on next use"""
+        with self._lock:
+            self.loaded_at = None
+
+    def _add(self, hearing_id, case_id, judge_id, courtroom_id, lawyer_ids, start, end):
+        self._hearings[hearing_id] = (start, end, case_id, judge_id, courtroom_id, tuple(lawyer_ids))
+        self._case_hearings[case_id].add(hearing_id)
+        if judge_id:
+            self._intervals['judge'].setdefault(judge_id, IntervalList()).add(start, end, hearing_id)
+        if courtroom_id:
+            self._intervals['courtroom'].setdefault(courtroom_id, IntervalList()).add(start, end, hearing_id)
+        for lawyer_id in lawyer_ids:
+            self._intervals['lawyer'].setdefault(lawyer_id, IntervalList()).add(start, end, hearing_id)
+
+    def _remove(self, hearing_id: int):
+        entry = self._hearings.pop(hearing_id, None)
+        if entry is None:
+            return None
+        start, end, case_id, judge_id, courtroom_id, lawyer_ids = entry
+        self._case_hearings[case_id].discard(hearing_id)
+        for kind, key in [('judge', judge_id), ('courtroom', courtroom_id)] + [('lawyer', l) for l in lawyer_ids]:
+            intervals = self._intervals[kind].get(key)
+            if intervals is not None:
+                intervals.remove(start, end, hearing_id)
+        return entry
+
+    def sync_hearing(self, db: Session, hearing: Hearing):
+        """Re-index a hearing after it was created, rescheduled, moved or cancelled"""
+        if not self.is_loaded:
+            return
+
+        if hearing.status not in ACTIVE_HEARING_STATUSES:
+            self.remove_hearing(hearing.id)
+            return
+
+        case_id = hearing.case_id
+        judge_id = db.query(Case.assigned_judge_id).filter(Case.id == case_id).scalar()
+        lawyer_ids = self._case_lawyers.get(case_id)
+        if lawyer_ids is None:
+            lawyer_ids = tuple(
+                lawyer_id for (lawyer_id,) in
+                db.query(CaseLawyer.lawyer_id).filter(CaseLawyer.case_id == case_id).all()
+            )
+        start = hearing.scheduled_date
+        end = hearing.scheduled_end or start + timedelta(hours=hearing.scheduled_duration_hours or 0)
+
+        with self._lock:
+            self._remove(hearing.id)
+            self._case_lawyers[case_id] = lawyer_ids
+            self._add(hearing.id, case_id, judge_id, hearing.courtroom_id, lawyer_ids, start, end)
+
+    def remove_hearing(self, hearing_id: int):
+        with self._lock:
+            self._remove(hearing_id)
+
+    def reassign_case_judge(self, case_id: int, judge_id: Optional[int]):
+        """Move a case's indexed hearings to a newly assigned (or no) judge"""
+        with self._lock:
+            for hearing_id in list(self._case_hearings.get(case_id, ())):
+                start, end, _, _, courtroom_id, lawyer_ids = self._remove(hearing_id)
+                self._add(hearing_id, case_id, judge_id, courtroom_id, lawyer_ids, start, end)
+
+    def conflicts(
+        self,
+        kind: str,
+        key: Optional[int],
+        start: datetime,
+        end: datetime,
+        exclude_hearing_id: Optional[int] = None
+    ) -> List[int]:
+        """Ids of active hearings overlapping [start, end) for a judge, courtroom or lawyer"""
+        with self._lock:
+            intervals = self._intervals[kind].get(key)
+            if intervals is None:
+                return []
+            return intervals.overlapping(start, end, exclude_hearing_id)
+
+    def is_free(
+        self,
+        kind: str,
+        key: Optional[int],
+        start: datetime,
+        end: datetime,
+        exclude_hearing_id: Optional[int] = None
+    ) -> bool:
+        with self._lock:
+            intervals = self._intervals[kind].get(key)
+            if intervals is None:
+                return True
+            return intervals.is_free(start, end, exclude_hearing_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hearings": len(self._hearings),
+                "judges": len(self._intervals['judge']),
+                "courtrooms": len(self._intervals['courtroom']),
+                "lawyers": len(self._intervals['lawyer'])
+            }
+
+
+# Global occupancy index instance
+occupancy_index = None
+
+def get_occupancy_index(db: Optional[Session] = None) -> OccupancyIndex:
+    """
+    Get or create the occupancy index (singleton pattern)
+
+    Args:
+        db: Session used to (re)load the index when it is missing or stale.
+            Write paths omit it and only update an index that is already loaded.
+    """
+    global occupancy_index
+    if occupancy_index is None:
+        occupancy_index = OccupancyIndex()
+    if db is not None:
+        occupancy_index.ensure_loaded(db)
+    return occupancy_index
@@ -0,0 +1,83 @@
+"""
+Keyset Pagination
+List endpoints page on a stable (sort key, id) order instead of OFFSET. The client gets
+an opaque cursor holding the key of the last row it saw, and the next page starts
+strictly after it, so every page is an index range scan of the same cost.
+
+The page body stays a plain list; the cursor for the next page travels in the
+X-Next-Cursor response header and is absent on the last page.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Date, DateTime, and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """Key values of a cursor, typed like the key columns; 400 if it was not issued for them"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort key")
+        return [_decode_value(column, value) for column, value in zip(keys, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def _after(keys: Sequence, values: Sequence[Any], descending: bool):
+    """Rows strictly after `values` in key order, expanded so each branch can use the index"""
+    branches = []
+    for position, column in enumerate(keys):
+        equal_prefix = [keys[i] == values[i] for i in range(position)]
+        beyond = column < values[position] if descending else column > values[position]
+        branches.append(and_(*equal_prefix, beyond))
+    return or_(*branches)
+
+def keyset_page(query, keys: Sequence, cursor: Optional[str], limit: int,
+                descending: bool = False, skip: int = 0):
+    """
+    Order a Query or select() by `keys` (ending in a unique column), start after `cursor`
+    and fetch one row beyond `limit` so finish_page can tell whether another page exists.
+    `skip` is the legacy offset and only applies when no cursor is given.
+    """
+    order = [column.desc() if descending else column.asc() for column in keys]
+    query = query.order_by(*order)
+    if cursor:
+        query = query.where(_after(keys, decode_cursor(cursor, keys), descending))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+def finish_page(rows: List[Any], keys: Sequence, limit: int, response: Response) -> List[Any]:
+    """Trim the look-ahead row and, if there was one, set the next-page cursor header"""
+    if len(rows) <= limit:
+        return rows
+    page = rows[:limit]
+    last = page[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in keys])
+    return page
@@ -0,0 +1,331 @@
+"""
+Workload Rebalancing
+Plans case transfers between the judges of a court so their loads end up as even as
+possible. Judges, jurisdictions and cases are held in NumPy arrays; each step moves the
+single case from the most loaded judge that lowers the load variance the most, to the
+least loaded judge who is available, specialized in the case's jurisdiction and not
+recused from it.
+
+Moving a case of load w from judge a to judge b changes the sum of squared loads by
+2w(L_b + w - L_a), so a move helps exactly when L_b + w < L_a and helps most when
+w(L_a - L_b - w) is largest.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from models import Case, Judge, JudgeRecusal, Jurisdiction
+from workload import ACTIVE_CASE_STATUSES
+
+JURISDICTIONS = [jurisdiction.value for jurisdiction in Jurisdiction]
+
+DEFAULT_MAX_TRANSFERS = 200
+
+# Gains below this are rounding noise, not an improvement
+MIN_GAIN = 1e-9
+
+
+def plan_transfers(
+    judge_ids: np.ndarray,
+    receivable: np.ndarray,
+    case_ids: np.ndarray,
+    case_judge: np.ndarray,
+    case_jurisdiction: np.ndarray,
+    case_load: np.ndarray,
+    recusals: Set[Tuple[int, int]],
+    max_transfers: int = DEFAULT_MAX_TRANSFERS
+) -> Tuple[List[Tuple[int, int, int]], np.ndarray, np.ndarray]:
+    """
+    Greedy variance-minimizing transfer plan.
+
+    Args:
+        judge_ids: (J,) judge ids
+        receivable: (J, K) True where the judge may take cases of jurisdiction k
+                    (available and specialized)
+        case_ids: (C,) case ids
+        case_judge: (C,) index into judge_ids of each case's current judge
+        case_jurisdiction: (C,) jurisdiction index of each case, -1 if it cannot move
+        case_load: (C,) load each case adds to its judge
+        recusals: (judge_id, case_id) pairs that must not be assigned
+        max_transfers: upper bound on the number of moves
+
+    Returns:
+        (moves as (case index, from judge index, to judge index), loads before, loads after)
+    """
+    n_judges = len(judge_ids)
+    loads = np.bincount(case_judge, weights=case_load, minlength=n_judges).astype(float)
+    initial_loads = loads.copy()
+    if n_judges < 2 or len(case_ids) == 0:
+        return [], initial_loads, loads
+
+    mean_load = loads.mean()
+    # Cases grouped by their original judge; cases moved in later are tracked per receiver
+    by_judge = np.argsort(case_judge, kind="stable")
+    block_starts = np.searchsorted(case_judge[by_judge], np.arange(n_judges + 1))
+    received: List[List[int]] = [[] for _ in range(n_judges)]
+    current_judge = case_judge.copy()
+
+    movable = case_jurisdiction >= 0
+    # Only judges above the mean can lower the variance by giving cases away
+    exhausted = loads <= mean_load
+    # Load of every judge in the columns of the jurisdictions it may receive, inf elsewhere
+    receiver_loads = np.where(receivable, loads[:, None], np.inf)
+    jurisdictions = np.arange(receivable.shape[1])
+    moves: List[Tuple[int, int, int]] = []
+
+    while len(moves) < max_transfers:
+        donor_loads = np.where(exhausted, -np.inf, loads)
+        donor = int(np.argmax(donor_loads))
+        if not np.isfinite(donor_loads[donor]):
+            break
+        donor_loads[donor] = -np.inf
+        next_donor_load = donor_loads.max()
+
+        # Least loaded eligible receiver per jurisdiction, excluding the donor
+        receiver_loads[donor, :] = np.inf
+        best_receiver = receiver_loads.argmin(axis=0)
+        best_load = receiver_loads[best_receiver, jurisdictions]
+
+        donor_cases = by_judge[block_starts[donor]:block_starts[donor + 1]]
+        if received[donor]:
+            donor_cases = np.concatenate([donor_cases, received[donor]])
+        donor_cases = donor_cases[(current_judge[donor_cases] == donor) & movable[donor_cases]]
+
+        weights = case_load[donor_cases]
+        target_loads = best_load[case_jurisdiction[donor_cases]]
+        gains = np.where(np.isfinite(target_loads), weights * (loads[donor] - target_loads - weights), -np.inf)
+
+        # Move cases in order of gain while the donor stays the most loaded judge. Receivers
+        # only fill up during the pass, so a case's real gain never exceeds its listed one.
+        moved = False
+        for pick in np.argsort(-gains, kind="stable"):
+            if gains[pick] <= MIN_GAIN or len(moves) >= max_transfers:
+                break
+            case_index = int(donor_cases[pick])
+            jurisdiction = case_jurisdiction[case_index]
+            receiver = int(best_receiver[jurisdiction])
+            load = case_load[case_index]
+            if load * (loads[donor] - loads[receiver] - load) <= MIN_GAIN:
+                continue
+            if (int(judge_ids[receiver]), int(case_ids[case_index])) in recusals:
+                continue
+
+            loads[donor] -= load
+            loads[receiver] += load
+            current_judge[case_index] = receiver
+            received[receiver].append(case_index)
+            moves.append((case_index, donor, receiver))
+            moved = True
+
+            receiver_loads[receiver] = np.where(receivable[receiver], loads[receiver], np.inf)
+            for k in np.flatnonzero(best_receiver == receiver):
+                best_receiver[k] = receiver_loads[:, k].argmin()
+            if loads[receiver] > mean_load:
+                exhausted[receiver] = False
+            if loads[donor] < next_donor_load:
+                break
+
+        receiver_loads[donor] = np.where(receivable[donor], loads[donor], np.inf)
+        if not moved:
+            exhausted[donor] = True
+
+    return moves, initial_loads, loads
+
+
+def load_stats(loads: np.ndarray) -> Dict[str, float]:
+    if len(loads) == 0:
+        return {"mean": 0.0, "std_deviation": 0.0, "maximum": 0.0, "minimum": 0.0}
+    return {
+        "mean": round(float(loads.mean()), 2),
+        "std_deviation": round(float(loads.std()), 2),
+        "maximum": round(float(loads.max()), 2),
+        "minimum": round(float(loads.min()), 2)
+    }
+
+
+def court_arrays(db: Session, court_id: Optional[int], metric: str = "cases") -> Dict[str, Any]:
+    """
+    Judges, active cases and recusals of a court (or every court) as arrays.
+    A case loads its judge by one unit with metric="cases", by its estimated hours with "hours".
+    """
+    judge_query = db.query(Judge).options(joinedload(Judge.user))
+    case_query = db.query(
+        Case.id, Case.case_number, Case.assigned_judge_id, Case.jurisdiction, Case.estimated_duration_hours
+    ).filter(
+        Case.assigned_judge_id.isnot(None),
+        Case.status.in_(ACTIVE_CASE_STATUSES)
+    )
+    if court_id:
+        judge_query = judge_query.filter(Judge.court_id == court_id)
+        case_query = case_query.filter(Case.court_id == court_id)
+    judges = judge_query.order_by(Judge.id).all()
+
+    judge_ids = np.array([judge.id for judge in judges], dtype=np.int64)
+    judge_index = {judge.id: i for i, judge in enumerate(judges)}
+    jurisdiction_index = {jurisdiction: k for k, jurisdiction in enumerate(JURISDICTIONS)}
+
+    receivable = np.zeros((len(judges), len(JURISDICTIONS)), dtype=bool)
+    for i, judge in enumerate(judges):
+        if judge.is_available is False:
+            continue
+        for specialization in judge.specializations or []:
+            k = jurisdiction_index.get(getattr(specialization, "value", specialization))
+            if k is not None:
+                receivable[i, k] = True
+
+    # Cases assigned to judges outside the court stay where they are
+    cases = [row for row in case_query.all() if row.assigned_judge_id in judge_index]
+    case_ids = np.array([row.id for row in cases], dtype=np.int64)
+    case_judge = np.array([judge_index[row.assigned_judge_id] for row in cases], dtype=np.int64)
+    case_jurisdiction = np.array([
+        jurisdiction_index.get(getattr(row.jurisdiction, "value", row.jurisdiction), -1) for row in cases
+    ], dtype=np.int64)
+    if metric == "hours":
+        case_load = np.array([row.estimated_duration_hours or 0.0 for row in cases], dtype=float)
+    else:
+        case_load = np.ones(len(cases), dtype=float)
+
+    recusals = set(db.query(JudgeRecusal.judge_id, JudgeRecusal.case_id).filter(
+        JudgeRecusal.judge_id.in_(judge_index)
+    ).all()) if judge_index else set()
+
+    return {
+        "judges": judges,
+        "judge_ids": judge_ids,
+        "judge_courts": np.array([judge.court_id or 0 for judge in judges], dtype=np.int64),
+        "receivable": receivable,
+        "cases": cases,
+        "case_ids": case_ids,
+        "case_judge": case_judge,
+        "case_jurisdiction": case_jurisdiction,
+        "case_load": case_load,
+        "recusals": recusals
+    }
+
+
+def rebalance(arrays: Dict[str, Any], max_transfers: int = DEFAULT_MAX_TRANSFERS):
+    """
+    Plan transfers court by court; a case never moves to a judge of another court.
+    Returns (moves as global indices, loads before, loads after).
+    """
+    judge_courts = arrays["judge_courts"]
+    all_moves: List[Tuple[int, int, int]] = []
+    before = np.zeros(len(judge_courts))
+    after = np.zeros(len(judge_courts))
+
+    for court in np.unique(judge_courts):
+        judge_positions = np.flatnonzero(judge_courts == court)
+        case_positions = np.flatnonzero(np.isin(arrays["case_judge"], judge_positions))
+        local_judge = np.searchsorted(judge_positions, arrays["case_judge"][case_positions])
+
+        moves, court_before, court_after = plan_transfers(
+            arrays["judge_ids"][judge_positions],
+            arrays["receivable"][judge_positions],
+            arrays["case_ids"][case_positions],
+            local_judge,
+            arrays["case_jurisdiction"][case_positions],
+            arrays["case_load"][case_positions],
+            arrays["recusals"],
+            max_transfers - len(all_moves)
+        )
+        before[judge_positions] = court_before
+        after[judge_positions] = court_after
+        all_moves.extend(
+            (int(case_positions[case]), int(judge_positions[source]), int(judge_positions[target]))
+            for case, source, target in moves
+        )
+        if len(all_moves) >= max_transfers:
+            break
+
+    return all_moves, before, after
+
+
+def rebalance_plan(
+    db: Session,
+    court_id: Optional[int],
+    metric: str = "cases",
+    max_transfers: int = DEFAULT_MAX_TRANSFERS,
+    arrays: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Transfer plan for a court (or every court, each balanced on its own)"""
+    started = time.perf_counter()
+    if arrays is None:
+        arrays = court_arrays(db, court_id, metric)
+    loaded = time.perf_counter()
+    moves, before, after = rebalance(arrays, max_transfers)
+    planned = time.perf_counter()
+
+    judges = arrays["judges"]
+    cases = arrays["cases"]
+
+    def judge_name(index: int) -> str:
+        judge = judges[index]
+        return judge.user.full_name if judge.user else f"Judge {judge.id}"
+
+    variance_before = float(before.var()) if len(before) else 0.0
+    variance_after = float(after.var()) if len(after) else 0.0
+    changed = np.flatnonzero(before != after)
+
+    return {
+        "court_id": court_id,
+        "metric": metric,
+        "total_judges": len(judges),
+        "active_cases": len(cases),
+        "before": load_stats(before),
+        "after": load_stats(after),
+        "variance_reduction_percentage": round(
+            (variance_before - variance_after) / variance_before * 100, 1
+        ) if variance_before else 0.0,
+        "transfers": [
+            {
+                "case_id": cases[case].id,
+                "case_number": cases[case].case_number,
+                "jurisdiction": JURISDICTIONS[arrays["case_jurisdiction"][case]],
+                "load": float(arrays["case_load"][case]),
+                "from_judge_id": judges[source].id,
+                "from_judge": judge_name(source),
+                "to_judge_id": judges[target].id,
+                "to_judge": judge_name(target)
+            }
+            for case, source, target in moves
+        ],
+        "judge_loads": [
+            {
+                "judge_id": judges[i].id,
+                "judge_name": judge_name(i),
+                "before": round(float(before[i]), 2),
+                "after": round(float(after[i]), 2)
+            }
+            for i in changed
+        ],
+        "timing_ms": {
+            "load": round((loaded - started) * 1000, 1),
+            "plan": round((planned - loaded) * 1000, 1)
+        }
+    }
+
+
+def summarize_moves(plan: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+    """Group a plan's transfers by (from judge, to judge), largest groups first"""
+    groups: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    loads = {entry["judge_id"]: entry for entry in plan["judge_loads"]}
+    for transfer in plan["transfers"]:
+        key = (transfer["from_judge_id"], transfer["to_judge_id"])
+        group = groups.get(key)
+        if group is None:
+            source = loads[transfer["from_judge_id"]]
+            group = groups[key] = {
+                "from_judge_id": transfer["from_judge_id"],
+                "from_judge": transfer["from_judge"],
+                "to_judge_id": transfer["to_judge_id"],
+                "to_judge": transfer["to_judge"],
+                "suggested_cases_count": 0,
+                "case_ids": [],
+                "reason": f"Reduce workload imbalance ({source['before']:g} → {source['after']:g} active {plan['metric']})"
+            }
+        group["suggested_cases_count"] += 1
+        group["case_ids"].append(transfer["case_id"])
+    return sorted(groups.values(), key=lambda group: -group["suggested_cases_count"])[:limit]
@@ -0,0 +1,246 @@
+"""
+Reference Data Cache
+In-process cache of the slow-changing rows nearly every request looks up: courts,
+courtrooms, judges (with their user's name) and the authenticated user. Rows are held as
+immutable snapshots rather than ORM instances, so they are safe to share across sessions
+and threads and never trigger lazy loads.
+
+Whole tables are loaded at once and kept for REFERENCE_CACHE_TTL_SECONDS; users are
+cached one by one by email. Write endpoints call invalidate() / invalidate_user() after
+they commit, and the TTL bounds staleness for writes made by other worker processes.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Court, Courtroom, Judge, User
+
+TTL_SECONDS = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "60"))
+MAX_USERS = int(os.getenv("REFERENCE_CACHE_MAX_USERS", "10000"))
+
+
+class CourtRef(NamedTuple):
+    id: int
+    name: str
+    level: Any
+    jurisdiction: Any
+    location: Optional[str]
+    parent_court_id: Optional[int]
+    is_active: Optional[bool]
+
+class CourtroomRef(NamedTuple):
+    id: int
+    court_id: Optional[int]
+    name: str
+    capacity: Optional[int]
+    is_available: Optional[bool]
+
+class JudgeRef(NamedTuple):
+    id: int
+    user_id: Optional[int]
+    court_id: Optional[int]
+    full_name: Optional[str]
+    specializations: Tuple[str, ...]
+    experience_years: Optional[int]
+    current_workload: Optional[int]  # as of the last load; ranking only
+    is_available: Optional[bool]
+
+class UserRef(NamedTuple):
+    id: int
+    email: str
+    full_name: str
+    role: Any
+    court_id: Optional[int]
+    is_active: Optional[bool]
+    created_at: Optional[datetime]
+
+
+def _load_courts(db: Session) -> Dict[int, CourtRef]:
+    rows = db.execute(select(
+        Court.id, Court.name, Court.level, Court.jurisdiction, Court.location,
+        Court.parent_court_id, Court.is_active
+    ))
+    return {row.id: CourtRef(*row) for row in rows}
+
+def _load_courtrooms(db: Session) -> Dict[int, CourtroomRef]:
+    rows = db.execute(select(
+        Courtroom.id, Courtroom.court_id, Courtroom.name, Courtroom.capacity, Courtroom.is_available
+    ))
+    return {row.id: CourtroomRef(*row) for row in rows}
+
+def _load_judges(db: Session) -> Dict[int, JudgeRef]:
+    rows = db.execute(select(
+        Judge.id, Judge.user_id, Judge.court_id, User.full_name, Judge.specializations,
+        Judge.experience_years, Judge.current_workload, Judge.is_available
+    ).outerjoin(User, User.id == Judge.user_id))
+    return {
+        row.id: JudgeRef(
+            row.id, row.user_id, row.court_id, row.full_name,
+            tuple(getattr(value, "value", value) for value in row.specializations or ()),
+            row.experience_years, row.current_workload, row.is_available
+        )
+        for row in rows
+    }
+
+TABLE_LOADERS: Dict[str, Callable[[Session], Dict[int, Any]]] = {
+    "courts": _load_courts,
+    "courtrooms": _load_courtrooms,
+    "judges": _load_judges
+}
+
+def _sorted(rows: Iterable) -> List:
+    return sorted(rows, key=lambda row: row.id)
+
+
+class ReferenceCache:
+    """TTL cache of whole reference tables plus an LRU of users by email"""
+
+    def __init__(self, ttl_seconds: int = TTL_SECONDS, max_users: int = MAX_USERS):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Tuple[float, Dict[int, Any]]] = {}
+        # Bumped on invalidation so a load that raced with a write is not stored
+        self._generations: Counter = Counter()
+        self._users: "OrderedDict[str, Tuple[float, UserRef]]" = OrderedDict()
+        self._user_generation = 0
+        self.hits = Counter()
+        self.misses = Counter()
+        self.invalidations = Counter()
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at <= self.ttl_seconds
+
+    def _table(self, db: Session, name: str) -> Dict[int, Any]:
+        with self._lock:
+            entry = self._tables.get(name)
+            if entry is not None and self._fresh(entry[0]):
+                self.hits[name] += 1
+                return entry[1]
+            self.misses[name] += 1
+            generation = self._generations[name]
+        rows = TABLE_LOADERS[name](db)
+        with self._lock:
+            if self._generations[name] == generation:
+                self._tables[name] = (time.monotonic(), rows)
+        return rows
+
+    def courts(self, db: Session) -> List[CourtRef]:
+        return _sorted(self._table(db, "courts").values())
+
+    def court(self, db: Session, court_id: int) -> Optional[CourtRef]:
+        return self._table(db, "courts").get(court_id)
+
+    def courtrooms(
+        self,
+        db: Session,
+        court_ids: Optional[Iterable[int]] = None,
+        available_only: bool = False
+    ) -> List[CourtroomRef]:
+        """Courtrooms ordered by id, optionally of some courts and only available ones"""
+        rows = self._table(db, "courtrooms").values()
+        if court_ids is not None:
+            court_ids = set(court_ids)
+            rows = [row for row in rows if row.court_id in court_ids]
+        if available_only:
+            rows = [row for row in rows if row.is_available]
+        return _sorted(rows)
+
+    def courtroom(self, db: Session, courtroom_id: int) -> Optional[CourtroomRef]:
+        return self._table(db, "courtrooms").get(courtroom_id)
+
+    def judges(
+        self,
+        db: Session,
+        court_id: Optional[int] = None,
+        available_only: bool = False,
+        ids: Optional[Iterable[int]] = None
+    ) -> List[JudgeRef]:
+        """Judges ordered by id, optionally of one court, available only or among ids"""
+        table = self._table(db, "judges")
+        rows = [table[judge_id] for judge_id in set(ids) if judge_id in table] if ids is not None else table.values()
+        if court_id is not None:
+            rows = [row for row in rows if row.court_id == court_id]
+        if available_only:
+            rows = [row for row in rows if row.is_available]
+        return _sorted(rows)
+
+    def judge(self, db: Session, judge_id: int) -> Optional[JudgeRef]:
+        return self._table(db, "judges").get(judge_id)
+
+    def user(self, db: Session, email: str) -> Optional[UserRef]:
+        """User by email; unknown emails are not cached"""
+        with self._lock:
+            entry = self._users.get(email)
+            if entry is not None and self._fresh(entry[0]):
+                self._users.move_to_end(email)
+                self.hits["users"] += 1
+                return entry[1]
+            self.misses["users"] += 1
+            generation = self._user_generation
+        row = db.execute(select(
+            User.id, User.email, User.full_name, User.role, User.court_id, User.is_active, User.created_at
+        ).where(User.email == email)).first()
+        if row is None:
+            return None
+        user = UserRef(*row)
+        with self._lock:
+            if self._user_generation == generation:
+                self._users[email] = (time.monotonic(), user)
+                self._users.move_to_end(email)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+        return user
+
+    def invalidate(self, *tables: str):
+        """Drop cached tables (all of them when none are named)"""
+        with self._lock:
+            for name in tables or tuple(TABLE_LOADERS):
+                self._tables.pop(name, None)
+                self._generations[name] += 1
+                self.invalidations[name] += 1
+
+    def invalidate_user(self, email: Optional[str] = None):
+        """Drop one cached user, or every cached user when email is None"""
+        with self._lock:
+            if email is None:
+                self._users.clear()
+            else:
+                self._users.pop(email, None)
+            self._user_generation += 1
+            self.invalidations["users"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = {name: len(entry[1]) for name, entry in self._tables.items()}
+            cached["users"] = len(self._users)
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "cached_rows": cached,
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "invalidations": dict(self.invalidations)
+            }
+
+
+# Global reference cache instance
+reference_cache = None
+
+def get_reference_cache() -> ReferenceCache:
+    """
+    Get or create the reference data cache (singleton pattern)
+
+    Returns:
+        ReferenceCache instance
+    """
+    global reference_cache
+    if reference_cache is None:
+        reference_cache = ReferenceCache()
+    return reference_cache
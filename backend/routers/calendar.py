@@ -1,67 +1,107 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, date
+from collections import defaultdict
 
-from database import get_db
+from database import get_db, get_async_db
 from models import Hearing, Case, Judge, Courtroom, User
 from schemas import CalendarHeatmap, CalendarSlot
 from routers.auth import get_current_user
+from occupancy import get_occupancy_index, ACTIVE_HEARING_STATUSES
+from slot_cache import get_slot_cache
+from utilization import utilization_query, HOURS_PER_COURTROOM_DAY
+from exports import export_response
+from court_hierarchy import court_filter, get_court_hierarchy
+from reference_cache import get_reference_cache
 
 router = APIRouter()
 
+def _cached_courtrooms(session: Session, court_id: Optional[int], include_subcourts: bool = False):
+    """Courtrooms of a court (and its subcourts) from the reference cache; all when court_id is None"""
+    if not court_id:
+        return get_reference_cache().courtrooms(session)
+    court_ids = get_court_hierarchy(session).subtree_court_ids(court_id) if include_subcourts else [court_id]
+    return get_reference_cache().courtrooms(session, court_ids)
+
+def _hearing_details_query():
+    """
+    Hearings with the case, courtroom and judge fields the calendar views display.
+    One joined SELECT of plain columns instead of lazy loads per hearing.
+    """
+    return select(
+        Hearing.id,
+        Hearing.courtroom_id,
+        Hearing.scheduled_date,
+        Hearing.scheduled_duration_hours,
+        Hearing.status,
+        Case.case_number,
+        Case.title.label("case_title"),
+        Case.case_type,
+        Case.urgency_level,
+        Courtroom.name.label("courtroom_name"),
+        User.full_name.label("judge_name")
+    ).join(Case, Hearing.case_id == Case.id).outerjoin(
+        Courtroom, Hearing.courtroom_id == Courtroom.id
+    ).outerjoin(
+        Judge, Case.assigned_judge_id == Judge.id
+    ).outerjoin(
+        User, Judge.user_id == User.id
+    )
+
 @router.get("/heatmap")
 async def get_calendar_heatmap(
     start_date: date = Query(..., description="Start date for heatmap"),
     end_date: date = Query(..., description="End date for heatmap"),
     court_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    format: str = Query("objects", pattern="^(objects|columnar)$", description="objects (one slot object each) or columnar (parallel arrays)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate calendar heatmap data for visualization"""
+    """
+    Generate calendar heatmap data for visualization
+    format=columnar returns the slots as parallel arrays and skips per-slot validation
+    """
     
     # Convert dates to datetime
     start_datetime = datetime.combine(start_date, datetime.min.time())
     end_datetime = datetime.combine(end_date, datetime.max.time())
     
-    # Get all hearings in the date range
-    query = db.query(Hearing).filter(
-        Hearing.scheduled_date >= start_datetime,
-        Hearing.scheduled_date <= end_datetime
-    )
-    
-    if court_id:
-        query = query.join(Case).filter(Case.court_id == court_id)
-    
-    hearings = query.all()
+    # One pre-aggregated row per courtroom-day from the utilization rollup
+    rollup = (await db.execute(utilization_query(start_date, end_date, court_id))).scalars().all()
     
     # Get all courtrooms for capacity calculation
-    courtroom_query = db.query(Courtroom)
-    if court_id:
-        courtroom_query = courtroom_query.filter(Courtroom.court_id == court_id)
-    
-    courtrooms = courtroom_query.all()
-    total_courtrooms = len(courtrooms)
-    
-    # Generate calendar slots
-    slots = []
+    courtrooms = await db.run_sync(_cached_courtrooms, court_id)
+    courtroom_ids = [courtroom.id for courtroom in courtrooms]
+    total_courtrooms = len(courtroom_ids)
+    
+    # Hours per day and per judge; each courtroom-day slot shows its dominant judge
+    # and the case of its earliest hearing
+    daily_hours = defaultdict(float)
+    judge_hours = defaultdict(float)
+    courtroom_days = {}
+    
+    for row in rollup:
+        daily_hours[row.day] += row.scheduled_hours
+        courtroom_days[row.day, row.courtroom_id] = row
+        for judge_id, hours in (row.judge_hours or {}).items():
+            judge_hours[int(judge_id)] += hours
+    
+    # Generate calendar slots as columns, one entry per (working day, courtroom)
+    slot_dates, slot_courtrooms, slot_judges, slot_cases, slot_statuses, slot_capacities = [], [], [], [], [], []
     current_date = start_datetime
     
     while current_date <= end_datetime:
         # Skip weekends
         if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-            
-            # Calculate daily metrics
-            daily_hearings = [h for h in hearings if h.scheduled_date.date() == current_date.date()]
-            
-            # Calculate capacity utilization
-            total_daily_hours = 0
-            for hearing in daily_hearings:
-                total_daily_hours += hearing.scheduled_duration_hours
+            day = current_date.date()
             
             # Assuming 8 working hours per day per courtroom
-            max_daily_capacity = total_courtrooms * 8
-            capacity_percentage = (total_daily_hours / max_daily_capacity * 100) if max_daily_capacity > 0 else 0
+            max_daily_capacity = total_courtrooms * HOURS_PER_COURTROOM_DAY
+            capacity_percentage = (daily_hours[day] / max_daily_capacity * 100) if max_daily_capacity > 0 else 0
             
             # Determine status based on capacity
             if capacity_percentage < 50:
@@ -74,35 +114,56 @@ async def get_calendar_heatmap(
                 status = "overloaded"
             
             # Create slots for each courtroom
-            for courtroom in courtrooms:
-                courtroom_hearings = [h for h in daily_hearings if h.courtroom_id == courtroom.id]
-                courtroom_hours = sum(h.scheduled_duration_hours for h in courtroom_hearings)
-                courtroom_capacity = (courtroom_hours / 8 * 100) if courtroom_hours <= 8 else 100
+            for courtroom_id in courtroom_ids:
+                row = courtroom_days.get((day, courtroom_id))
+                hours = row.scheduled_hours if row else 0
                 
-                slot = CalendarSlot(
-                    date=current_date,
-                    courtroom_id=courtroom.id,
-                    judge_id=courtroom_hearings[0].case.assigned_judge_id if courtroom_hearings else None,
-                    case_id=courtroom_hearings[0].case_id if courtroom_hearings else None,
-                    status=status,
-                    capacity_percentage=courtroom_capacity
-                )
-                slots.append(slot)
+                slot_dates.append(current_date)
+                slot_courtrooms.append(courtroom_id)
+                slot_judges.append(row.dominant_judge_id if row else None)
+                slot_cases.append(row.first_case_id if row else None)
+                slot_statuses.append(status)
+                slot_capacities.append((hours / HOURS_PER_COURTROOM_DAY * 100) if hours <= HOURS_PER_COURTROOM_DAY else 100)
         
         current_date += timedelta(days=1)
     
     # Calculate judge workload distribution
-    judges = db.query(Judge).all()
-    workload_distribution = {}
-    
-    for judge in judges:
-        judge_hearings = [h for h in hearings if h.case.assigned_judge_id == judge.id]
-        total_hours = sum(h.scheduled_duration_hours for h in judge_hearings)
-        # Assuming 40 hours per week capacity
-        weeks_in_period = (end_date - start_date).days / 7
-        max_capacity = weeks_in_period * 40
-        workload_percentage = (total_hours / max_capacity * 100) if max_capacity > 0 else 0
-        workload_distribution[judge.id] = min(workload_percentage, 100)
+    judge_ids = (await db.execute(select(Judge.id))).scalars().all()
+    
+    # Assuming 40 hours per week capacity
+    weeks_in_period = (end_date - start_date).days / 7
+    max_capacity = weeks_in_period * 40
+    workload_distribution = {
+        judge_id: min((judge_hours[judge_id] / max_capacity * 100) if max_capacity > 0 else 0, 100)
+        for judge_id in judge_ids
+    }
+    
+    if format == "columnar":
+        return JSONResponse({
+            "date_range": {"start": start_datetime.isoformat(), "end": end_datetime.isoformat()},
+            "slot_count": len(slot_dates),
+            "dates": [slot_date.date().isoformat() for slot_date in slot_dates],
+            "courtroom_ids": slot_courtrooms,
+            "judge_ids": slot_judges,
+            "case_ids": slot_cases,
+            "statuses": slot_statuses,
+            "capacity_percentage": [round(capacity, 2) for capacity in slot_capacities],
+            "workload_distribution": workload_distribution
+        })
+    
+    slots = [
+        CalendarSlot(
+            date=slot_date,
+            courtroom_id=courtroom_id,
+            judge_id=judge_id,
+            case_id=case_id,
+            status=status,
+            capacity_percentage=capacity
+        )
+        for slot_date, courtroom_id, judge_id, case_id, status, capacity in zip(
+            slot_dates, slot_courtrooms, slot_judges, slot_cases, slot_statuses, slot_capacities
+        )
+    ]
     
     return CalendarHeatmap(
         date_range={"start": start_datetime, "end": end_datetime},
@@ -114,7 +175,8 @@ async def get_calendar_heatmap(
 async def get_day_view(
     target_date: date = Query(..., description="Date to view"),
     court_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    include_subcourts: bool = Query(False, description="with court_id, also every court under it"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get detailed day view with courtroom-wise schedule"""
@@ -123,52 +185,44 @@ async def get_day_view(
     end_datetime = datetime.combine(target_date, datetime.max.time())
     
     # Get hearings for the day
-    query = db.query(Hearing).filter(
+    query = _hearing_details_query().where(
         Hearing.scheduled_date >= start_datetime,
         Hearing.scheduled_date <= end_datetime
-    ).join(Case)
+    )
     
     if court_id:
-        query = query.filter(Case.court_id == court_id)
+        query = query.where(court_filter(Case.court_id, court_id, include_subcourts))
     
-    hearings = query.all()
+    hearings = (await db.execute(query.order_by(Hearing.scheduled_date))).all()
     
     # Get courtrooms
-    courtroom_query = db.query(Courtroom)
-    if court_id:
-        courtroom_query = courtroom_query.filter(Courtroom.court_id == court_id)
-    
-    courtrooms = courtroom_query.all()
+    courtrooms = await db.run_sync(_cached_courtrooms, court_id, include_subcourts)
     
     # Organize by courtroom and time
-    schedule = {}
-    
-    for courtroom in courtrooms:
-        courtroom_hearings = [h for h in hearings if h.courtroom_id == courtroom.id]
-        courtroom_hearings.sort(key=lambda x: x.scheduled_date)
-        
-        schedule[courtroom.id] = {
+    schedule = {
+        courtroom.id: {
             "courtroom_name": courtroom.name,
             "hearings": []
         }
+        for courtroom in courtrooms
+    }
+    
+    # Hearings arrive ordered by time, so each courtroom list stays sorted
+    for hearing in hearings:
+        if hearing.courtroom_id not in schedule:
+            continue
         
-        for hearing in courtroom_hearings:
-            case = hearing.case
-            judge = case.assigned_judge
-            
-            hearing_info = {
-                "hearing_id": hearing.id,
-                "case_number": case.case_number,
-                "case_title": case.title,
-                "scheduled_time": hearing.scheduled_date,
-                "duration_hours": hearing.scheduled_duration_hours,
-                "judge_name": judge.user.full_name if judge and judge.user else "Unassigned",
-                "status": hearing.status,
-                "urgency_level": case.urgency_level.value,
-                "case_type": case.case_type
-            }
-            
-            schedule[courtroom.id]["hearings"].append(hearing_info)
+        schedule[hearing.courtroom_id]["hearings"].append({
+            "hearing_id": hearing.id,
+            "case_number": hearing.case_number,
+            "case_title": hearing.case_title,
+            "scheduled_time": hearing.scheduled_date,
+            "duration_hours": hearing.scheduled_duration_hours,
+            "judge_name": hearing.judge_name or "Unassigned",
+            "status": hearing.status,
+            "urgency_level": hearing.urgency_level.value,
+            "case_type": hearing.case_type
+        })
     
     return {
         "date": target_date,
@@ -186,7 +240,8 @@ async def get_day_view(
 async def get_week_view(
     week_start: date = Query(..., description="Start of week (Monday)"),
     court_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    include_subcourts: bool = Query(False, description="with court_id, also every court under it"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get week view with detailed time slots"""
@@ -200,15 +255,15 @@ async def get_week_view(
     end_datetime = datetime.combine(week_end, datetime.max.time())
     
     # Get hearings for the week
-    query = db.query(Hearing).filter(
+    query = _hearing_details_query().where(
         Hearing.scheduled_date >= start_datetime,
         Hearing.scheduled_date <= end_datetime
-    ).join(Case)
+    )
     
     if court_id:
-        query = query.filter(Case.court_id == court_id)
+        query = query.where(court_filter(Case.court_id, court_id, include_subcourts))
     
-    hearings = query.all()
+    hearings = (await db.execute(query)).all()
     
     # Organize by day
     week_schedule = {}
@@ -245,11 +300,11 @@ async def get_week_view(
                 "hearings": [
                     {
                         "hearing_id": h.id,
-                        "case_number": h.case.case_number,
-                        "case_title": h.case.title,
-                        "courtroom": h.courtroom.name,
+                        "case_number": h.case_number,
+                        "case_title": h.case_title,
+                        "courtroom": h.courtroom_name,
                         "duration": h.scheduled_duration_hours,
-                        "judge": h.case.assigned_judge.user.full_name if h.case.assigned_judge and h.case.assigned_judge.user else "Unassigned"
+                        "judge": h.judge_name or "Unassigned"
                     }
                     for h in slot_hearings
                 ]
@@ -282,7 +337,7 @@ async def get_upcoming_hearings(
     days_ahead: int = Query(7, description="Number of days to look ahead"),
     judge_id: Optional[int] = None,
     courtroom_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get upcoming hearings for quick view"""
@@ -290,38 +345,35 @@ async def get_upcoming_hearings(
     start_date = datetime.now()
     end_date = start_date + timedelta(days=days_ahead)
     
-    query = db.query(Hearing).filter(
+    query = _hearing_details_query().where(
         Hearing.scheduled_date >= start_date,
         Hearing.scheduled_date <= end_date,
         Hearing.status.in_(["scheduled", "hearing"])
-    ).join(Case)
+    )
     
     if judge_id:
-        query = query.filter(Case.assigned_judge_id == judge_id)
+        query = query.where(Case.assigned_judge_id == judge_id)
     
     if courtroom_id:
-        query = query.filter(Hearing.courtroom_id == courtroom_id)
+        query = query.where(Hearing.courtroom_id == courtroom_id)
     
     # Filter by user's court if not admin
     if current_user.role not in ["chief_justice", "court_administrator"]:
-        query = query.filter(Case.court_id == current_user.court_id)
+        query = query.where(Case.court_id == current_user.court_id)
     
-    hearings = query.order_by(Hearing.scheduled_date).all()
+    hearings = (await db.execute(query.order_by(Hearing.scheduled_date))).all()
     
     upcoming = []
     for hearing in hearings:
-        case = hearing.case
-        judge = case.assigned_judge
-        
         upcoming.append({
             "hearing_id": hearing.id,
-            "case_number": case.case_number,
-            "case_title": case.title,
+            "case_number": hearing.case_number,
+            "case_title": hearing.case_title,
             "scheduled_date": hearing.scheduled_date,
             "duration_hours": hearing.scheduled_duration_hours,
-            "courtroom": hearing.courtroom.name,
-            "judge": judge.user.full_name if judge and judge.user else "Unassigned",
-            "urgency": case.urgency_level.value,
+            "courtroom": hearing.courtroom_name,
+            "judge": hearing.judge_name or "Unassigned",
+            "urgency": hearing.urgency_level.value,
             "days_until": (hearing.scheduled_date.date() - datetime.now().date()).days
         })
     
@@ -334,8 +386,50 @@ async def get_upcoming_hearings(
         }
     }
 
+@router.get("/hearings/export")
+def export_hearings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    court_id: Optional[int] = None,
+    include_subcourts: bool = Query(False, description="with court_id, also every court under it"),
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream hearings with their case, courtroom and judge as NDJSON or CSV, in time order"""
+    query = select(
+        Hearing.id,
+        Hearing.case_id,
+        Case.case_number,
+        Case.court_id,
+        Hearing.courtroom_id,
+        Courtroom.name.label("courtroom_name"),
+        Case.assigned_judge_id.label("judge_id"),
+        Hearing.scheduled_date,
+        Hearing.scheduled_end,
+        Hearing.scheduled_duration_hours,
+        Hearing.actual_duration_hours,
+        Hearing.status,
+        Hearing.adjournment_reason
+    ).join(Case, Hearing.case_id == Case.id).outerjoin(Courtroom, Hearing.courtroom_id == Courtroom.id)
+    
+    if start_date:
+        query = query.where(Hearing.scheduled_date >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        query = query.where(Hearing.scheduled_date <= datetime.combine(end_date, datetime.max.time()))
+    if court_id:
+        query = query.where(court_filter(Case.court_id, court_id, include_subcourts))
+    if status:
+        query = query.where(Hearing.status == status)
+    
+    # Filter by user's court if not admin
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        query = query.where(Case.court_id == current_user.court_id)
+    
+    return export_response(query.order_by(Hearing.scheduled_date, Hearing.id), "hearings", format)
+
 @router.post("/drag-drop-reschedule")
-async def drag_drop_reschedule(
+def drag_drop_reschedule(
     hearing_id: int,
     new_datetime: datetime,
     new_courtroom_id: Optional[int] = None,
@@ -357,12 +451,11 @@ async def drag_drop_reschedule(
     # Check for conflicts at new time
     end_time = new_datetime + timedelta(hours=hearing.scheduled_duration_hours)
     
-    conflicts = db.query(Hearing).filter(
+    conflicts = db.query(Hearing).options(joinedload(Hearing.case)).filter(
         Hearing.courtroom_id == target_courtroom_id,
-        Hearing.scheduled_date < end_time,
-        Hearing.scheduled_date + timedelta(hours=Hearing.scheduled_duration_hours) > new_datetime,
+        Hearing.overlaps(new_datetime, end_time),
         Hearing.id != hearing_id,
-        Hearing.status.in_(["scheduled", "hearing"])
+        Hearing.status.in_(ACTIVE_HEARING_STATUSES)
     ).all()
     
     if conflicts:
@@ -383,6 +476,7 @@ async def drag_drop_reschedule(
         }
     
     # Update hearing
+    old_datetime, old_courtroom_id = hearing.scheduled_date, hearing.courtroom_id
     hearing.scheduled_date = new_datetime
     if new_courtroom_id:
         hearing.courtroom_id = new_courtroom_id
@@ -391,6 +485,14 @@ async def drag_drop_reschedule(
     
     db.commit()
     
+    get_occupancy_index().sync_hearing(db, hearing)
+    slot_cache = get_slot_cache()
+    for start, courtroom_id in ((old_datetime, old_courtroom_id), (new_datetime, target_courtroom_id)):
+        slot_cache.invalidate_hearing(
+            "drag_drop_reschedule", hearing.case.assigned_judge_id, courtroom_id,
+            start, hearing.scheduled_duration_hours
+        )
+    
     return {
         "success": True,
         "message": "Hearing rescheduled successfully",
@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import (
+    DateTime, Integer, and_, any_, bindparam, case as sql_case, cast, func, insert, literal, or_,
+    select, update
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from database import get_db
-from models import Case, User, CaseStatusHistory
-from schemas import CaseCreate, CaseResponse, CaseStatusEnum
+from models import Case, CaseStatus, User, CaseStatusHistory
+from schemas import (
+    BulkStatusResponse, BulkStatusUpdate, CaseCreate, CaseResponse, CaseStatusEnum
+)
 from routers.auth import get_current_user
+from occupancy import get_occupancy_index
+from slot_cache import get_slot_cache
+from pagination import MAX_PAGE_SIZE, keyset_page, finish_page
+from exports import export_response
+from dwell_times import GROUP_COLUMNS, dwell_time_stats
+from court_hierarchy import court_filter
+import workload
 import uuid
 
 router = APIRouter()
@@ -18,7 +32,7 @@ def generate_case_number(court_id: int, case_type: str) -> str:
     return f"{court_id}/{case_type}/{year}/{unique_id}"
 
 @router.post("/", response_model=CaseResponse)
-async def create_case(
+def create_case(
     case: CaseCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -58,13 +72,16 @@ async def create_case(
     return db_case
 
 @router.get("/", response_model=List[CaseResponse])
-async def get_cases(
+def get_cases(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     status: Optional[CaseStatusEnum] = None,
     jurisdiction: Optional[str] = None,
     urgency: Optional[str] = None,
     court_id: Optional[int] = None,
+    include_subcourts: bool = Query(False, description="with court_id, also cases of every court under it"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -78,17 +95,181 @@ async def get_cases(
     if urgency:
         query = query.filter(Case.urgency_level == urgency)
     if court_id:
-        query = query.filter(Case.court_id == court_id)
+        query = query.filter(court_filter(Case.court_id, court_id, include_subcourts))
     
     # For non-admin users, filter by their court
     if current_user.role not in ["chief_justice", "court_administrator"]:
         query = query.filter(Case.court_id == current_user.court_id)
     
-    cases = query.offset(skip).limit(limit).all()
-    return cases
+    # Ordered by filing date; a cursor seeks past the previous page instead of skipping rows
+    keys = (Case.filing_date, Case.id)
+    cases = keyset_page(query, keys, cursor, limit, skip=skip).all()
+    return finish_page(cases, keys, limit, response)
+
+@router.get("/export")
+def export_cases(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    status: Optional[CaseStatusEnum] = None,
+    jurisdiction: Optional[str] = None,
+    urgency: Optional[str] = None,
+    court_id: Optional[int] = None,
+    include_subcourts: bool = Query(False, description="with court_id, also cases of every court under it"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every matching case as NDJSON or CSV, in id order"""
+    query = select(
+        Case.id,
+        Case.case_number,
+        Case.title,
+        Case.court_id,
+        Case.jurisdiction,
+        Case.case_type,
+        Case.status,
+        Case.urgency_level,
+        Case.complexity_score,
+        Case.public_interest_score,
+        Case.estimated_duration_hours,
+        Case.filing_date,
+        Case.assigned_judge_id
+    )
+    
+    # Apply filters
+    if status:
+        query = query.where(Case.status == status)
+    if jurisdiction:
+        query = query.where(Case.jurisdiction == jurisdiction)
+    if urgency:
+        query = query.where(Case.urgency_level == urgency)
+    if court_id:
+        query = query.where(court_filter(Case.court_id, court_id, include_subcourts))
+    
+    # For non-admin users, filter by their court
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        query = query.where(Case.court_id == current_user.court_id)
+    
+    return export_response(query.order_by(Case.id), "cases", format)
+
+# Days from filing a case is expected to take to leave each pending status
+CUMULATIVE_EXPECTED_DAYS = {
+    "filed": 7,
+    "admitted": 37,  # 7 + 30
+    "listed": 51,  # 7 + 30 + 14
+    "hearing": 111,  # 7 + 30 + 14 + 60
+    "reserved": 141  # 7 + 30 + 14 + 60 + 30
+}
+
+def _days_since_filing(db: Session, now: datetime):
+    """Whole days between filing_date and now, computed by the database"""
+    if db.get_bind().dialect.name == "postgresql":
+        elapsed = func.extract("epoch", literal(now, DateTime) - Case.filing_date) / 86400
+        return cast(func.floor(elapsed), Integer)
+    return cast(func.julianday(literal(now, DateTime)) - func.julianday(Case.filing_date), Integer)
+
+@router.get("/delayed")
+def get_delayed_cases(
+    response: Response,
+    threshold_days: int = 30,
+    court_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all cases delayed beyond threshold, most delayed first"""
+    now = datetime.now()
+    days_pending = _days_since_filing(db, now)
+    expected = sql_case(CUMULATIVE_EXPECTED_DAYS, value=Case.status, else_=30)
+    delay = days_pending - expected
+    severity = sql_case(
+        (delay > 90, "critical"),
+        (delay > 60, "high"),
+        else_="moderate"
+    )
+
+    # delay > threshold as one filing-date cutoff per status, so the filter is an index range
+    delayed = or_(*[
+        and_(
+            Case.status == status,
+            Case.filing_date <= now - timedelta(days=expected_days + threshold_days + 1)
+        )
+        for status, expected_days in CUMULATIVE_EXPECTED_DAYS.items()
+    ])
+    if court_id:
+        delayed = and_(delayed, Case.court_id == court_id)
+
+    severities = select(severity.label("severity")).where(delayed).subquery()
+    severity_counts = dict(
+        db.execute(select(severities.c.severity, func.count()).group_by(severities.c.severity)).all()
+    )
+
+    keys = (delay.label("delay_days"), Case.id)
+    query = select(
+        Case.id,
+        Case.case_number,
+        Case.title,
+        Case.status,
+        Case.urgency_level,
+        Case.filing_date,
+        days_pending.label("days_pending"),
+        expected.label("expected_days"),
+        keys[0],
+        severity.label("delay_severity")
+    ).where(delayed)
+    rows = db.execute(keyset_page(query, keys, cursor, limit, descending=True)).all()
+    rows = finish_page(rows, keys, limit, response)
+
+    return {
+        "total_delayed": sum(severity_counts.values()),
+        "threshold_days": threshold_days,
+        "delayed_cases": [
+            {
+                "case_id": row.id,
+                "case_number": row.case_number,
+                "title": row.title,
+                "status": row.status,
+                "urgency_level": row.urgency_level.value if row.urgency_level else None,
+                "filing_date": row.filing_date.isoformat(),
+                "days_pending": row.days_pending,
+                "expected_days": row.expected_days,
+                "delay_days": row.delay_days,
+                "delay_severity": row.delay_severity
+            }
+            for row in rows
+        ],
+        "severity_breakdown": {
+            level: severity_counts.get(level, 0) for level in ("critical", "high", "moderate")
+        }
+    }
+
+@router.get("/dwell-times")
+def get_dwell_times(
+    court_id: Optional[int] = None,
+    jurisdiction: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    group_by: List[str] = Query(
+        ["court", "jurisdiction"], description="court and/or jurisdiction; status alone for per-status totals"
+    ),
+    include_open: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Time spent in each status across all cases, as mean and p50/p90/p99 in days"""
+    unknown = set(group_by) - set(GROUP_COLUMNS) - {"status"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {', '.join(sorted(unknown))}")
+    
+    # For non-admin users, restrict to their court
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        court_id = current_user.court_id
+    
+    return dwell_time_stats(
+        db, court_id, jurisdiction, start_date, end_date,
+        group_by=[name for name in dict.fromkeys(group_by) if name != "status"], include_open=include_open
+    )
 
 @router.get("/{case_id}", response_model=CaseResponse)
-async def get_case(
+def get_case(
     case_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -105,7 +286,7 @@ async def get_case(
     return case
 
 @router.put("/{case_id}/status")
-async def update_case_status(
+def update_case_status(
     case_id: int,
     new_status: CaseStatusEnum,
     notes: Optional[str] = None,
@@ -137,8 +318,96 @@ async def update_case_status(
     
     return {"message": "Case status updated successfully"}
 
+def _id_in(db: Session, column, ids: List[int]):
+    """column = ANY(:ids) on Postgres (one array parameter, one cached plan), IN elsewhere"""
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return column.in_(ids)
+
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+def bulk_update_case_status(
+    request: BulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Move many cases to one status in a single transaction: the cases are locked and read
+    once, updated with one UPDATE and their history rows written with one batched INSERT.
+    Cases that cannot be moved are reported per case; with all_or_nothing nothing is written
+    unless every case can be moved.
+    """
+    if current_user.role not in ["chief_justice", "presiding_judge", "court_administrator"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    case_ids = list(dict.fromkeys(request.case_ids))
+    new_status = CaseStatus(request.new_status.value)
+    all_courts = current_user.role in ["chief_justice", "court_administrator"]
+
+    # Lock in id order so concurrent batches cannot deadlock on each other
+    rows = db.execute(
+        select(
+            Case.id, Case.court_id, Case.status,
+            Case.assigned_judge_id, Case.urgency_level, Case.estimated_duration_hours
+        ).where(_id_in(db, Case.id, case_ids)).order_by(Case.id).with_for_update()
+    ).all()
+    found = {row.id: row for row in rows}
+
+    results = []
+    moved = []
+    for case_id in case_ids:
+        row = found.get(case_id)
+        if row is None:
+            results.append({"case_id": case_id, "result": "not_found"})
+            continue
+        entry = {"case_id": case_id, "old_status": row.status, "new_status": row.status}
+        if not all_courts and row.court_id != current_user.court_id:
+            entry["result"] = "forbidden"
+        elif row.status == new_status:
+            entry["result"] = "unchanged"
+        elif request.expected_status and row.status != request.expected_status:
+            entry["result"] = "skipped"
+        else:
+            entry["result"] = "updated"
+            entry["new_status"] = new_status
+            moved.append(row)
+        results.append(entry)
+
+    if request.all_or_nothing and any(entry["result"] not in ("updated", "unchanged") for entry in results):
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Some cases cannot be moved; nothing was updated", "results": results}
+        )
+
+    if moved:
+        moved_ids = [row.id for row in moved]
+        db.execute(
+            update(Case).where(_id_in(db, Case.id, moved_ids)).values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+        changed_at = datetime.utcnow()
+        db.execute(insert(CaseStatusHistory), [
+            {
+                "case_id": row.id,
+                "old_status": row.status,
+                "new_status": new_status,
+                "changed_by": current_user.id,
+                "change_date": changed_at,
+                "notes": request.notes
+            }
+            for row in moved
+        ])
+        # The Core UPDATE skips the flush hook that maintains judge workload counters
+        workload.apply_status_changes(db, [
+            (row.assigned_judge_id, row.status, row.urgency_level, row.estimated_duration_hours)
+            for row in moved
+        ], new_status)
+    db.commit()
+
+    return {"updated": len(moved), "results": results}
+
 @router.get("/{case_id}/history")
-async def get_case_history(
+def get_case_history(
     case_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -154,7 +423,7 @@ async def get_case_history(
     return history
 
 @router.get("/search/{case_number}")
-async def search_case_by_number(
+def search_case_by_number(
     case_number: str,
     db: Session = Depends(get_db)
 ):
@@ -174,7 +443,7 @@ async def search_case_by_number(
     }
 
 @router.put("/{case_id}/assign-judge")
-async def assign_judge_to_case(
+def assign_judge_to_case(
     case_id: int,
     judge_id: int,
     db: Session = Depends(get_db),
@@ -187,9 +456,13 @@ async def assign_judge_to_case(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
+    previous_judge_id = case.assigned_judge_id
     case.assigned_judge_id = judge_id
     db.commit()
     
+    get_occupancy_index().reassign_case_judge(case_id, judge_id)
+    get_slot_cache().invalidate("assign_judge", judge_ids=[previous_judge_id, judge_id])
+    
     return {"message": "Judge assigned successfully"}
 
 
@@ -273,7 +546,7 @@ async def calculate_case_complexity(
 
 
 @router.get("/{case_id}/delays")
-async def get_case_delays(
+def get_case_delays(
     case_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -334,66 +607,9 @@ async def get_case_delays(
         "urgency_level": case.urgency_level.value if case.urgency_level else None
     }
 
-@router.get("/delayed")
-async def get_delayed_cases(
-    threshold_days: int = 30,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get all cases delayed beyond threshold"""
-    cases = db.query(Case).filter(
-        Case.status.in_(["filed", "admitted", "listed", "hearing", "reserved"])
-    ).all()
-    
-    delayed_cases = []
-    current_date = datetime.now()
-    
-    for case in cases:
-        days_pending = (current_date - case.filing_date).days
-        
-        # Simple delay calculation
-        expected_days = {
-            "filed": 7,
-            "admitted": 37,  # 7 + 30
-            "listed": 51,  # 7 + 30 + 14
-            "hearing": 111,  # 7 + 30 + 14 + 60
-            "reserved": 141  # 7 + 30 + 14 + 60 + 30
-        }
-        
-        expected = expected_days.get(case.status, 30)
-        delay = days_pending - expected
-        
-        if delay > threshold_days:
-            delayed_cases.append({
-                "case_id": case.id,
-                "case_number": case.case_number,
-                "title": case.title,
-                "status": case.status,
-                "urgency_level": case.urgency_level.value if case.urgency_level else None,
-                "filing_date": case.filing_date.isoformat(),
-                "days_pending": days_pending,
-                "expected_days": expected,
-                "delay_days": delay,
-                "delay_severity": "critical" if delay > 90 else "high" if delay > 60 else "moderate"
-            })
-    
-    # Sort by delay (most delayed first)
-    delayed_cases.sort(key=lambda x: x["delay_days"], reverse=True)
-    
-    return {
-        "total_delayed": len(delayed_cases),
-        "threshold_days": threshold_days,
-        "delayed_cases": delayed_cases,
-        "severity_breakdown": {
-            "critical": len([c for c in delayed_cases if c["delay_severity"] == "critical"]),
-            "high": len([c for c in delayed_cases if c["delay_severity"] == "high"]),
-            "moderate": len([c for c in delayed_cases if c["delay_severity"] == "moderate"])
-        }
-    }
-
 
 @router.post("/{case_id}/transfer")
-async def transfer_case(
+def transfer_case(
     case_id: int,
     target_court_id: int,
     reason: str,
@@ -419,6 +635,7 @@ async def transfer_case(
     
     # Store old court info
     old_court_id = case.court_id
+    old_judge_id = case.assigned_judge_id
     old_court = db.query(Court).filter(Court.id == old_court_id).first()
     
     # Update case
@@ -437,6 +654,9 @@ async def transfer_case(
     db.add(status_history)
     db.commit()
     
+    get_occupancy_index().reassign_case_judge(case_id, None)
+    get_slot_cache().invalidate("transfer_case", judge_ids=[old_judge_id])
+    
     return {
         "message": "Case transferred successfully",
         "case_id": case_id,
@@ -446,7 +666,7 @@ async def transfer_case(
     }
 
 @router.get("/{case_id}/transfer-history")
-async def get_transfer_history(
+def get_transfer_history(
     case_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1,35 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from datetime import datetime, timedelta
 
-from database import get_db
-from models import Court, User
+from database import get_async_db
+from models import Case, Court, Courtroom, CourtroomDailyUtilization, Judge, User
+from schemas import CourtCreate, CourtResponse, CourtUpdate
 from routers.auth import get_current_user
+from court_hierarchy import court_filter, subtree_cte
+import court_hierarchy
+from reference_cache import get_reference_cache
+from pagination import MAX_PAGE_SIZE, keyset_page, finish_page
+from utilization import HOURS_PER_COURTROOM_DAY
 
 router = APIRouter()
 
+# Matches the optimization report: cases not yet in hearing
+PENDING_CASE_STATUSES = ["filed", "admitted", "listed"]
+
+# Days ahead summarized in the courtroom utilization figures
+UTILIZATION_WINDOW_DAYS = 30
+
 @router.get("/")
 async def get_courts(
+    response: Response,
     level: Optional[str] = None,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="page size; all courts when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all courts with optional level filter"""
-    query = db.query(Court)
+    query = select(Court)
     
     if level:
-        query = query.filter(Court.level == level)
+        query = query.where(Court.level == level)
     
-    courts = query.all()
+    keys = (Court.id,)
+    if limit is None:
+        courts = (await db.execute(query.order_by(Court.id))).scalars().all()
+    else:
+        courts = (await db.execute(keyset_page(query, keys, cursor, limit))).scalars().all()
+        courts = finish_page(courts, keys, limit, response)
+    
+    # Parent names for the whole page in one lookup
+    parent_ids = {court.parent_court_id for court in courts if court.parent_court_id}
+    parent_names = dict((await db.execute(
+        select(Court.id, Court.name).where(Court.id.in_(parent_ids))
+    )).all()) if parent_ids else {}
     
-    # Build hierarchy
     court_list = []
     for court in courts:
-        parent_name = None
-        if court.parent_court_id:
-            parent = db.query(Court).filter(Court.id == court.parent_court_id).first()
-            parent_name = parent.name if parent else None
-        
         court_list.append({
             "id": court.id,
             "name": court.name,
@@ -37,83 +59,181 @@ async def get_courts(
             "jurisdiction": court.jurisdiction.value if court.jurisdiction else None,
             "location": court.location,
             "parent_court_id": court.parent_court_id,
-            "parent_court_name": parent_name,
+            "parent_court_name": parent_names.get(court.parent_court_id),
             "is_active": court.is_active,
             "created_at": court.created_at.isoformat() if court.created_at else None
         })
     
     return court_list
 
-@router.get("/hierarchy")
-async def get_court_hierarchy(
-    db: Session = Depends(get_db),
+@router.post("/", response_model=CourtResponse)
+async def create_court(
+    court: CourtCreate,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get court hierarchy tree structure"""
-    courts = db.query(Court).all()
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    # Build tree structure
-    court_map = {}
-    for court in courts:
-        court_map[court.id] = {
-            "id": court.id,
-            "name": court.name,
-            "level": court.level.value if court.level else None,
-            "jurisdiction": court.jurisdiction.value if court.jurisdiction else None,
-            "location": court.location,
-            "parent_court_id": court.parent_court_id,
-            "children": []
-        }
+    if court.parent_court_id and not await db.get(Court, court.parent_court_id):
+        raise HTTPException(status_code=404, detail="Parent court not found")
+    
+    db_court = Court(**court.model_dump())
+    db.add(db_court)
+    await db.commit()
+    await db.refresh(db_court)
+    get_reference_cache().invalidate("courts")
+    return db_court
+
+@router.put("/{court_id}", response_model=CourtResponse)
+async def update_court(
+    court_id: int,
+    court: CourtUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    db_court = await db.get(Court, court_id)
+    if not db_court:
+        raise HTTPException(status_code=404, detail="Court not found")
+    
+    changes = court.model_dump(exclude_unset=True)
+    parent_id = changes.get("parent_court_id")
+    if parent_id:
+        if not await db.get(Court, parent_id):
+            raise HTTPException(status_code=404, detail="Parent court not found")
+        subtree_ids = (await db.execute(select(subtree_cte(court_id).c.id))).scalars().all()
+        if parent_id in subtree_ids:
+            raise HTTPException(status_code=400, detail="A court cannot be placed under itself or one of its subcourts")
     
-    # Build hierarchy
-    root_courts = []
-    for court_id, court_data in court_map.items():
-        if court_data["parent_court_id"]:
-            parent = court_map.get(court_data["parent_court_id"])
-            if parent:
-                parent["children"].append(court_data)
-        else:
-            root_courts.append(court_data)
+    for field, value in changes.items():
+        setattr(db_court, field, value)
+    await db.commit()
+    await db.refresh(db_court)
+    get_reference_cache().invalidate("courts")
+    return db_court
+
+@router.get("/hierarchy")
+async def get_court_hierarchy(
+    root_court_id: Optional[int] = Query(None, description="only the subtree under this court"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get court hierarchy tree structure, served from the cached tree"""
+    hierarchy = await db.run_sync(court_hierarchy.get_court_hierarchy)
+    if root_court_id is not None:
+        court_ids = set(hierarchy.subtree_court_ids(root_court_id))
+        if not court_ids:
+            raise HTTPException(status_code=404, detail="Court not found")
+        courts = [court for court in hierarchy.courts() if court["id"] in court_ids]
+    else:
+        courts = hierarchy.courts()
     
     return {
-        "hierarchy": root_courts,
+        "hierarchy": hierarchy.tree(root_court_id),
         "total_courts": len(courts),
         "levels": {
-            "supreme_court": len([c for c in courts if c.level.value == "supreme_court"]),
-            "high_court": len([c for c in courts if c.level.value == "high_court"]),
-            "district_court": len([c for c in courts if c.level.value == "district_court"])
+            level: len([c for c in courts if c["level"] == level])
+            for level in ("supreme_court", "high_court", "district_court")
         }
     }
 
+@router.get("/{court_id}/subtree")
+async def get_court_subtree(
+    court_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ids of a court and every court under it"""
+    hierarchy = await db.run_sync(court_hierarchy.get_court_hierarchy)
+    court_ids = hierarchy.subtree_court_ids(court_id)
+    if not court_ids:
+        raise HTTPException(status_code=404, detail="Court not found")
+    return {"court_id": court_id, "subtree_court_ids": court_ids}
+
 @router.get("/statistics")
 async def get_court_statistics(
-    db: Session = Depends(get_db),
+    window_days: int = Query(UTILIZATION_WINDOW_DAYS, ge=1, le=365, description="days ahead for courtroom utilization"),
+    court_id: Optional[int] = None,
+    include_subcourts: bool = Query(False, description="with court_id, also every court under it"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get court system statistics"""
-    from models import Case, Judge
+    """Get court system statistics, from one grouped aggregate per table"""
+    def scoped(query, column):
+        return query.where(court_filter(column, court_id, include_subcourts)) if court_id else query
+    
+    courts = (await db.execute(scoped(select(Court), Court.id).order_by(Court.id))).scalars().all()
+    
+    case_counts = {
+        group_court_id: (cases_count, pending_count)
+        for group_court_id, cases_count, pending_count in await db.execute(
+            scoped(select(
+                Case.court_id,
+                func.count(Case.id),
+                func.count(Case.id).filter(Case.status.in_(PENDING_CASE_STATUSES))
+            ), Case.court_id).group_by(Case.court_id)
+        )
+    }
+    judge_counts = {
+        group_court_id: (judges_count, available_count)
+        for group_court_id, judges_count, available_count in await db.execute(
+            scoped(select(
+                Judge.court_id,
+                func.count(Judge.id),
+                func.count(Judge.id).filter(Judge.is_available.isnot(False))
+            ), Judge.court_id).group_by(Judge.court_id)
+        )
+    }
+    courtroom_counts = dict((await db.execute(
+        scoped(select(Courtroom.court_id, func.count(Courtroom.id)), Courtroom.court_id).group_by(Courtroom.court_id)
+    )).all())
     
-    courts = db.query(Court).all()
-    total_cases = db.query(Case).count()
-    total_judges = db.query(Judge).count()
+    # Courtroom utilization over the coming weeks, read from the daily rollup
+    window_start = datetime.now().date()
+    window_end = window_start + timedelta(days=window_days)
+    scheduled_hours = dict((await db.execute(
+        scoped(select(
+            CourtroomDailyUtilization.court_id,
+            func.coalesce(func.sum(CourtroomDailyUtilization.scheduled_hours), 0.0)
+        ).where(
+            CourtroomDailyUtilization.day >= window_start,
+            CourtroomDailyUtilization.day < window_end
+        ), CourtroomDailyUtilization.court_id).group_by(CourtroomDailyUtilization.court_id)
+    )).all())
+    working_days = sum(1 for offset in range(window_days) if (window_start + timedelta(days=offset)).weekday() < 5)
     
     court_stats = []
     for court in courts:
-        cases_count = db.query(Case).filter(Case.court_id == court.id).count()
-        judges_count = db.query(Judge).filter(Judge.court_id == court.id).count()
+        cases_count, pending_count = case_counts.get(court.id, (0, 0))
+        judges_count, available_count = judge_counts.get(court.id, (0, 0))
+        hours = scheduled_hours.get(court.id, 0.0)
+        capacity_hours = courtroom_counts.get(court.id, 0) * working_days * HOURS_PER_COURTROOM_DAY
         
         court_stats.append({
             "court_id": court.id,
             "court_name": court.name,
             "level": court.level.value if court.level else None,
             "cases_count": cases_count,
+            "pending_cases": pending_count,
             "judges_count": judges_count,
-            "utilization": round((cases_count / max(judges_count * 10, 1)) * 100, 1)
+            "available_judges": available_count,
+            "courtrooms_count": courtroom_counts.get(court.id, 0),
+            "utilization": round((cases_count / max(judges_count * 10, 1)) * 100, 1),
+            "courtroom_utilization": {
+                "scheduled_hours": hours,
+                "capacity_hours": capacity_hours,
+                "utilization_percentage": round(hours / capacity_hours * 100, 1) if capacity_hours else 0
+            }
         })
     
     return {
         "total_courts": len(courts),
-        "total_cases": total_cases,
-        "total_judges": total_judges,
+        "total_cases": sum(cases_count for cases_count, _ in case_counts.values()),
+        "total_pending_cases": sum(pending_count for _, pending_count in case_counts.values()),
+        "total_judges": sum(judges_count for judges_count, _ in judge_counts.values()),
+        "utilization_window_days": window_days,
         "court_statistics": court_stats
     }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import hashlib
@@ -10,6 +10,7 @@ from database import get_db
 from models import Document, Case, User
 from schemas import DocumentCreate, DocumentResponse
 from routers.auth import get_current_user
+from pagination import MAX_PAGE_SIZE, keyset_page, finish_page
 
 router = APIRouter()
 
@@ -31,7 +32,7 @@ def generate_digital_signature(file_hash: str, user_id: int) -> str:
     return hashlib.sha256(signature_data.encode()).hexdigest()
 
 @router.post("/upload", response_model=DocumentResponse)
-async def upload_document(
+def upload_document(
     case_id: int,
     title: str,
     document_type: str,
@@ -53,7 +54,7 @@ async def upload_document(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Read file content
-    file_content = await file.read()
+    file_content = file.file.read()
     file_hash = calculate_file_hash(file_content)
     
     # Generate unique filename
@@ -97,9 +98,12 @@ async def upload_document(
     return db_document
 
 @router.get("/case/{case_id}", response_model=List[DocumentResponse])
-async def get_case_documents(
+def get_case_documents(
     case_id: int,
+    response: Response,
     document_type: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="page size; all documents when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -119,11 +123,15 @@ async def get_case_documents(
     if document_type:
         query = query.filter(Document.document_type == document_type)
     
-    documents = query.order_by(Document.upload_date.desc()).all()
-    return documents
+    # Newest first; id breaks ties between uploads in the same instant
+    keys = (Document.upload_date, Document.id)
+    if limit is None:
+        return query.order_by(Document.upload_date.desc(), Document.id.desc()).all()
+    documents = keyset_page(query, keys, cursor, limit, descending=True).all()
+    return finish_page(documents, keys, limit, response)
 
 @router.get("/{document_id}", response_model=DocumentResponse)
-async def get_document(
+def get_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -144,7 +152,7 @@ async def get_document(
     return document
 
 @router.get("/{document_id}/download")
-async def download_document(
+def download_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -174,7 +182,7 @@ async def download_document(
     )
 
 @router.post("/{document_id}/verify")
-async def verify_document(
+def verify_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -214,7 +222,7 @@ async def verify_document(
     }
 
 @router.get("/search/semantic")
-async def semantic_document_search(
+def semantic_document_search(
     query: str,
     case_id: Optional[int] = None,
     document_type: Optional[str] = None,
@@ -266,7 +274,7 @@ async def semantic_document_search(
     }
 
 @router.get("/legal-entities/extract")
-async def extract_legal_entities(
+def extract_legal_entities(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -305,7 +313,7 @@ async def extract_legal_entities(
     }
 
 @router.get("/citation-network/{document_id}")
-async def get_citation_network(
+def get_citation_network(
     document_id: int,
     depth: int = 2,
     db: Session = Depends(get_db),
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import numpy as np
 
 from database import get_db
-from models import Judge, User, JudgeRecusal, Case
+from models import Judge, User, JudgeRecusal, Case, JudgeWorkload
 from schemas import JudgeCreate, JudgeResponse, JurisdictionEnum
 from routers.auth import get_current_user
+from occupancy import get_occupancy_index
+from slot_cache import get_slot_cache
+from reference_cache import get_reference_cache
+from specialization_index import get_specialization_index
+from workload import ACTIVE_CASE_STATUSES, workload_breakdown
+from rebalancing import DEFAULT_MAX_TRANSFERS, court_arrays, rebalance_plan, summarize_moves
+from pagination import MAX_PAGE_SIZE, keyset_page, finish_page
 
 router = APIRouter()
 
 @router.post("/", response_model=JudgeResponse)
-async def create_judge(
+def create_judge(
     judge: JudgeCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -39,13 +48,20 @@ async def create_judge(
     db.add(db_judge)
     db.commit()
     db.refresh(db_judge)
+    
+    get_slot_cache().invalidate("create_judge", court_id=db_judge.court_id)
+    get_specialization_index().add_judge(db_judge)
+    get_reference_cache().invalidate("judges")
     return db_judge
 
 @router.get("/", response_model=List[JudgeResponse])
-async def get_judges(
+def get_judges(
+    response: Response,
     court_id: Optional[int] = None,
     specialization: Optional[JurisdictionEnum] = None,
     available_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="page size; all judges when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -55,16 +71,19 @@ async def get_judges(
         query = query.filter(Judge.court_id == court_id)
     
     if specialization:
-        query = query.filter(Judge.specializations.contains([specialization]))
+        query = query.filter(Judge.id.in_(get_specialization_index(db).eligible_judge_ids(specialization)))
     
     if available_only:
         query = query.filter(Judge.is_available == True)
     
-    judges = query.all()
-    return judges
+    keys = (Judge.id,)
+    if limit is None:
+        return query.order_by(Judge.id).all()
+    judges = keyset_page(query, keys, cursor, limit).all()
+    return finish_page(judges, keys, limit, response)
 
 @router.get("/workload-analysis")
-async def analyze_judge_workload(
+def analyze_judge_workload(
     court_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -73,11 +92,8 @@ async def analyze_judge_workload(
     Analyze judge workload distribution and identify imbalances
     Returns workload statistics and rebalancing suggestions
     """
-    query = db.query(Judge)
-    if court_id:
-        query = query.filter(Judge.court_id == court_id)
-    
-    judges = query.all()
+    arrays = court_arrays(db, court_id)
+    judges = arrays["judges"]
     
     if not judges:
         return {
@@ -87,70 +103,80 @@ async def analyze_judge_workload(
             "suggestions": []
         }
     
-    # Calculate workload statistics
-    workloads = [j.current_workload or 0 for j in judges]
-    avg_workload = sum(workloads) / len(workloads) if workloads else 0
-    max_workload = max(workloads) if workloads else 0
-    min_workload = min(workloads) if workloads else 0
+    # Maintained active-case counts, one array operation per statistic
+    workloads = np.array([judge.current_workload or 0 for judge in judges], dtype=float)
+    available = np.array([judge.is_available is not False for judge in judges])
+    avg_workload = float(workloads.mean())
+    max_workload = int(workloads.max())
+    min_workload = int(workloads.min())
     
     # Identify overloaded judges (>2x average or >80%)
-    overloaded = []
-    underloaded = []
-    
-    for judge in judges:
-        workload = judge.current_workload or 0
-        if workload > avg_workload * 2 or workload > 80:
-            overloaded.append({
-                "judge_id": judge.id,
-                "judge_name": judge.user.full_name if judge.user else f"Judge {judge.id}",
-                "current_workload": workload,
-                "excess": workload - avg_workload,
-                "severity": "critical" if workload > 90 else "high" if workload > 80 else "moderate"
-            })
-        elif workload < avg_workload * 0.5 and judge.is_available:
-            underloaded.append({
-                "judge_id": judge.id,
-                "judge_name": judge.user.full_name if judge.user else f"Judge {judge.id}",
-                "current_workload": workload,
-                "capacity": avg_workload - workload
-            })
-    
-    # Generate rebalancing suggestions
-    suggestions = []
-    if overloaded and underloaded:
-        for over in overloaded[:3]:  # Top 3 overloaded
-            for under in underloaded[:2]:  # Top 2 underloaded
-                cases_to_transfer = min(3, int(over["excess"] / 2))
-                if cases_to_transfer > 0:
-                    suggestions.append({
-                        "from_judge_id": over["judge_id"],
-                        "from_judge": over["judge_name"],
-                        "to_judge_id": under["judge_id"],
-                        "to_judge": under["judge_name"],
-                        "suggested_cases_count": cases_to_transfer,
-                        "reason": f"Reduce workload imbalance ({over['current_workload']}% → {over['current_workload'] - cases_to_transfer*5}%)"
-                    })
+    overloaded_mask = (workloads > avg_workload * 2) | (workloads > 80)
+    underloaded_mask = ~overloaded_mask & (workloads < avg_workload * 0.5) & available
+    
+    def judge_name(judge: Judge) -> str:
+        return judge.user.full_name if judge.user else f"Judge {judge.id}"
+    
+    overloaded = [
+        {
+            "judge_id": judges[i].id,
+            "judge_name": judge_name(judges[i]),
+            "current_workload": int(workloads[i]),
+            "excess": float(workloads[i] - avg_workload),
+            "severity": "critical" if workloads[i] > 90 else "high" if workloads[i] > 80 else "moderate"
+        }
+        for i in np.flatnonzero(overloaded_mask)
+    ]
+    underloaded = [
+        {
+            "judge_id": judges[i].id,
+            "judge_name": judge_name(judges[i]),
+            "current_workload": int(workloads[i]),
+            "capacity": float(avg_workload - workloads[i])
+        }
+        for i in np.flatnonzero(underloaded_mask)
+    ]
+    
+    # Suggestions are the judge pairs of an actual transfer plan
+    plan = rebalance_plan(db, court_id, arrays=arrays)
     
     return {
         "total_judges": len(judges),
-        "available_judges": len([j for j in judges if j.is_available]),
+        "available_judges": int(available.sum()),
         "workload_stats": {
             "average": round(avg_workload, 1),
             "maximum": max_workload,
             "minimum": min_workload,
-            "std_deviation": round(
-                (sum((w - avg_workload) ** 2 for w in workloads) / len(workloads)) ** 0.5, 1
-            ) if len(workloads) > 1 else 0
+            "std_deviation": round(float(workloads.std()), 1) if len(workloads) > 1 else 0
         },
         "overloaded_judges": overloaded,
         "underloaded_judges": underloaded,
         "balance_score": round(100 - (max_workload - min_workload), 1),  # 100 = perfect balance
-        "suggestions": suggestions,
+        "suggestions": summarize_moves(plan),
         "needs_rebalancing": len(overloaded) > 0
     }
 
+@router.get("/rebalance-plan")
+def get_rebalance_plan(
+    court_id: Optional[int] = None,
+    metric: str = Query("cases", pattern="^(cases|hours)$", description="balance active case counts or estimated hours"),
+    max_transfers: int = Query(DEFAULT_MAX_TRANSFERS, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Plan case transfers that even out judge workloads within each court
+    Respects jurisdiction and recusals; nothing is reassigned until the plan is applied
+    """
+    if current_user.role not in ["chief_justice", "court_administrator"]:
+        if court_id and court_id != current_user.court_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        court_id = current_user.court_id
+    
+    return rebalance_plan(db, court_id, metric, max_transfers)
+
 @router.get("/{judge_id}", response_model=JudgeResponse)
-async def get_judge(
+def get_judge(
     judge_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -161,7 +187,7 @@ async def get_judge(
     return judge
 
 @router.put("/{judge_id}/availability")
-async def update_judge_availability(
+def update_judge_availability(
     judge_id: int,
     is_available: bool,
     db: Session = Depends(get_db),
@@ -177,10 +203,15 @@ async def update_judge_availability(
     judge.is_available = is_available
     db.commit()
     
+    # The judge joins or leaves the eligible set of every slot search in the court
+    get_slot_cache().invalidate("judge_availability", court_id=judge.court_id)
+    get_specialization_index().set_available(judge.id, is_available)
+    get_reference_cache().invalidate("judges")
+    
     return {"message": "Judge availability updated"}
 
 @router.post("/{judge_id}/recusal")
-async def create_recusal(
+def create_recusal(
     judge_id: int,
     case_id: int,
     reason: str,
@@ -217,15 +248,20 @@ async def create_recusal(
     db.add(recusal)
     
     # If this judge was assigned to the case, unassign them
-    if case.assigned_judge_id == judge_id:
+    unassigned = case.assigned_judge_id == judge_id
+    if unassigned:
         case.assigned_judge_id = None
     
     db.commit()
     
+    if unassigned:
+        get_occupancy_index().reassign_case_judge(case_id, None)
+        get_slot_cache().invalidate("recusal", judge_ids=[judge_id])
+    
     return {"message": "Recusal created successfully"}
 
 @router.get("/{judge_id}/workload")
-async def get_judge_workload(
+def get_judge_workload(
     judge_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -234,41 +270,32 @@ async def get_judge_workload(
     if not judge:
         raise HTTPException(status_code=404, detail="Judge not found")
     
-    # Get active cases assigned to judge
-    active_cases = db.query(Case).filter(
+    # Totals and urgency counts are maintained counters; complexity is grouped in SQL
+    counters = workload_breakdown(db.get(JudgeWorkload, judge_id))
+    complexity_counts = db.query(Case.complexity_score, func.count(Case.id)).filter(
         Case.assigned_judge_id == judge_id,
-        Case.status.in_(["admitted", "listed", "hearing", "reserved"])
-    ).all()
-    
-    # Calculate workload metrics
-    total_cases = len(active_cases)
-    total_estimated_hours = sum(case.estimated_duration_hours for case in active_cases)
+        Case.status.in_(ACTIVE_CASE_STATUSES),
+        Case.complexity_score.isnot(None)
+    ).group_by(Case.complexity_score).order_by(Case.complexity_score).all()
     
-    # Group by urgency and complexity
-    urgency_breakdown = {}
-    complexity_breakdown = {}
-    
-    for case in active_cases:
-        urgency = case.urgency_level.value
-        urgency_breakdown[urgency] = urgency_breakdown.get(urgency, 0) + 1
-        
-        complexity = case.complexity_score
-        complexity_range = f"{complexity}-{min(complexity + 1, 10)}"
-        complexity_breakdown[complexity_range] = complexity_breakdown.get(complexity_range, 0) + 1
+    complexity_breakdown = {
+        f"{complexity}-{min(complexity + 1, 10)}": count
+        for complexity, count in complexity_counts
+    }
     
     return {
         "judge_id": judge_id,
-        "total_active_cases": total_cases,
-        "total_estimated_hours": total_estimated_hours,
+        "total_active_cases": counters["total_active_cases"],
+        "total_estimated_hours": counters["total_estimated_hours"],
         "current_workload_percentage": judge.current_workload,
-        "urgency_breakdown": urgency_breakdown,
+        "urgency_breakdown": counters["urgency_breakdown"],
         "complexity_breakdown": complexity_breakdown,
         "performance_score": judge.performance_score,
         "disposal_rate": judge.disposal_rate
     }
 
 @router.get("/{judge_id}/schedule")
-async def get_judge_schedule(
+def get_judge_schedule(
     judge_id: int,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -6,11 +6,14 @@ from database import get_db
 from models import Lawyer, User
 from schemas import LawyerCreate, LawyerResponse
 from routers.auth import get_current_user
+from occupancy import get_occupancy_index
+from specialization_index import specializations_contain
+from pagination import MAX_PAGE_SIZE, keyset_page, finish_page
 
 router = APIRouter()
 
 @router.post("/", response_model=LawyerResponse)
-async def create_lawyer(
+def create_lawyer(
     lawyer: LawyerCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -41,25 +44,31 @@ async def create_lawyer(
     return db_lawyer
 
 @router.get("/", response_model=List[LawyerResponse])
-async def get_lawyers(
+def get_lawyers(
+    response: Response,
     specialization: Optional[str] = None,
     available_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="page size; all lawyers when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     query = db.query(Lawyer)
     
     if specialization:
-        query = query.filter(Lawyer.specializations.contains([specialization]))
+        query = query.filter(specializations_contain(db, Lawyer.specializations, specialization))
     
     if available_only:
         query = query.filter(Lawyer.is_available == True)
     
-    lawyers = query.all()
-    return lawyers
+    keys = (Lawyer.id,)
+    if limit is None:
+        return query.order_by(Lawyer.id).all()
+    lawyers = keyset_page(query, keys, cursor, limit).all()
+    return finish_page(lawyers, keys, limit, response)
 
 @router.get("/{lawyer_id}", response_model=LawyerResponse)
-async def get_lawyer(
+def get_lawyer(
     lawyer_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -71,7 +80,7 @@ async def get_lawyer(
 
 
 @router.post("/{lawyer_id}/unavailability")
-async def add_unavailability(
+def add_unavailability(
     lawyer_id: int,
     start_date: str,
     end_date: str,
@@ -116,7 +125,7 @@ async def add_unavailability(
     }
 
 @router.get("/{lawyer_id}/unavailability")
-async def get_unavailability(
+def get_unavailability(
     lawyer_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -134,7 +143,7 @@ async def get_unavailability(
     }
 
 @router.get("/{lawyer_id}/conflicts")
-async def check_conflicts(
+def check_conflicts(
     lawyer_id: int,
     date: str,
     db: Session = Depends(get_db),
@@ -142,7 +151,7 @@ async def check_conflicts(
 ):
     """Check if lawyer has conflicts on a specific date"""
     from models import Hearing
-    from datetime import datetime
+    from datetime import datetime, timedelta
     
     lawyer = db.query(Lawyer).filter(Lawyer.id == lawyer_id).first()
     if not lawyer:
@@ -153,18 +162,18 @@ async def check_conflicts(
     except:
         raise HTTPException(status_code=400, detail="Invalid date format")
     
-    # Check hearings on that date
-    hearings = db.query(Hearing).filter(
-        Hearing.scheduled_date == check_date
-    ).all()
+    # Look up the lawyer's hearings on that date in the occupancy index
+    day_start = datetime.combine(check_date, datetime.min.time())
+    hearing_ids = get_occupancy_index(db).conflicts('lawyer', lawyer_id, day_start, day_start + timedelta(days=1))
+    
+    hearings = []
+    if hearing_ids:
+        hearings = db.query(Hearing).filter(Hearing.id.in_(hearing_ids)).order_by(Hearing.scheduled_date).all()
     
-    # Check if lawyer is involved in any cases on that date
     conflicts = []
     for hearing in hearings:
         case = hearing.case
         if case:
-            # Check if lawyer is representing any party in this case
-            # This is simplified - in production, check case_lawyers table
             conflicts.append({
                 "hearing_id": hearing.id,
                 "case_number": case.case_number,
@@ -177,4 +186,4 @@ async def check_conflicts(
         "date": date,
         "has_conflicts": len(conflicts) > 0,
         "conflicts": conflicts
-    }
+    }
\ No newline at end of file
@@ -95,7 +95,7 @@ def generate_analysis_summary(outcome_prob: float, duration: float, num_judges:
 
 # API Endpoints
 @router.post("/analyze-case", response_model=CaseAnalysisResponse)
-async def analyze_case(
+def analyze_case(
     request: CaseAnalysisRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
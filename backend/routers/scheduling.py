@@ -1,15 +1,82 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_, func
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from collections import defaultdict
+import math
+import numpy as np
 
 from database import get_db
-from models import Case, Judge, Courtroom, Hearing, User
-from schemas import SchedulingRequest, SchedulingResponse, HearingCreate, HearingResponse
+from models import Case, Judge, Hearing, User, JudgeRecusal, CaseStatus, CourtroomDailyUtilization
+from schemas import (
+    SchedulingRequest, SchedulingResponse, HearingCreate, HearingResponse,
+    BatchSchedulingRequest, BatchSchedulingResponse
+)
 from routers.auth import get_current_user
+from occupancy import get_occupancy_index, ACTIVE_HEARING_STATUSES
+from slot_cache import get_slot_cache, SlotCacheEntry
+from specialization_index import get_specialization_index
+from reference_cache import get_reference_cache
+from utilization import HOURS_PER_COURTROOM_DAY
 
 router = APIRouter()
 
+# Priority weights shared by the per-slot and batch scoring
+URGENCY_WEIGHTS = {
+    'habeas_corpus': 10.0,
+    'bail': 8.0,
+    'injunction': 6.0,
+    'regular': 1.0
+}
+
+# Hourly slots of a court day (9 AM to 5 PM)
+WORKING_HOURS = list(range(9, 17))
+
+# Days searched by find_available_slots
+SLOT_WINDOW_DAYS = 30
+
+# Days ahead summarized in the optimization report's utilization figures
+UTILIZATION_WINDOW_DAYS = 30
+
+# Subtracted per working day of delay so the batch scheduler prefers earlier slots
+BATCH_DAY_PENALTY = 0.1
+
+def _case_base_score(case: Case, now: datetime) -> float:
+    """Slot-independent part of the priority score: urgency, case age and public interest"""
+    score = URGENCY_WEIGHTS.get(case.urgency_level.value if case.urgency_level else 'regular', 1.0)
+    score += min((now - case.filing_date).days * 0.1, 5.0)
+    score += case.public_interest_score * 0.5
+    return score
+
+def score_candidates(
+    case: Case,
+    judge_workloads: np.ndarray,
+    slot_hours: np.ndarray,
+    now: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    Vectorized SchedulingEngine._calculate_priority_score
+    judge_workloads and slot_hours hold one entry per candidate slot; the case terms
+    are computed once and broadcast, so the result matches the scalar score exactly.
+    """
+    scores = _case_base_score(case, now or datetime.now()) + np.maximum(0, 10 - judge_workloads) * 0.3
+    if case.public_interest_score > 7:
+        scores = scores + np.where(slot_hours < 12, 2.0, 0.0)
+    return scores
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the top_k scores, highest first and earliest first on ties (like a stable
+    sort), selected with a linear-time partition instead of sorting every candidate
+    """
+    if len(scores) > top_k:
+        threshold = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        indices = np.flatnonzero(scores >= threshold)
+    else:
+        indices = np.arange(len(scores))
+    return indices[np.argsort(-scores[indices], kind='stable')][:top_k]
+
 class SchedulingEngine:
     """
     Constraint-based scheduling engine
@@ -18,109 +85,197 @@ class SchedulingEngine:
     
     def __init__(self, db: Session):
         self.db = db
-    
-    def find_available_slots(self, case_id: int, constraints: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Find available time slots for a case based on constraints"""
+        self.occupancy = get_occupancy_index(db)
+        self.slot_cache = get_slot_cache()
+    
+    def find_available_slots(self, case_id: int, constraints: Dict[str, Any], top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the top_k available time slots for a case based on constraints
+        The free (slot, judge, courtroom) set for the case's court, jurisdiction, window and
+        duration comes from the slot cache; only scoring and top_k selection run per request.
+        """
         case = self.db.query(Case).filter(Case.id == case_id).first()
         if not case:
             return []
         
+        now = datetime.now()
+        
+        # Generate time slots for next 30 days (excluding weekends)
+        start_date = now + timedelta(days=constraints.get('min_advance_days', 7))
+        key = (case.court_id, case.jurisdiction.value if case.jurisdiction else None, start_date.date(), case.estimated_duration_hours)
+        
+        entry = self.slot_cache.get(key)
+        if entry is None:
+            entry = self._build_slot_set(case, start_date)
+            self.slot_cache.put(key, entry)
+        slots = entry.data
+        
+        candidates = np.arange(len(slots['cand_slot']))
+        
+        # Recusals are per case, so they are applied on top of the shared slot set
+        recused = [
+            judge_id for (judge_id,) in
+            self.db.query(JudgeRecusal.judge_id).filter(JudgeRecusal.case_id == case.id).all()
+        ]
+        if recused:
+            candidates = np.flatnonzero(~np.isin(slots['judge_ids'][slots['cand_judge']], recused))
+        
+        if not len(candidates):
+            return []
+        
+        cand_slot = slots['cand_slot'][candidates]
+        cand_judge = slots['cand_judge'][candidates]
+        cand_room = slots['cand_room'][candidates]
+        
+        # Score every candidate in one broadcast operation
+        scores = score_candidates(case, slots['judge_workloads'][cand_judge], slots['slot_hours'][cand_slot], now)
+        
+        return [
+            {
+                'datetime': slots['slot_times'][cand_slot[i]],
+                'judge_id': int(slots['judge_ids'][cand_judge[i]]),
+                'judge_name': slots['judge_names'][cand_judge[i]],
+                'courtroom_id': int(slots['courtroom_ids'][cand_room[i]]),
+                'courtroom_name': slots['courtroom_names'][cand_room[i]],
+                'estimated_duration': case.estimated_duration_hours,
+                'priority_score': float(scores[i])
+            }
+            for i in _top_k_indices(scores, top_k)
+        ]
+    
+    def _build_slot_set(self, case: Case, start_date: datetime) -> SlotCacheEntry:
+        """Compute the free (slot, judge, courtroom) candidates of a window as compact index arrays"""
         # Get eligible judges based on specialization
-        eligible_judges = self.db.query(Judge).filter(
-            Judge.specializations.contains([case.jurisdiction]),
-            Judge.is_available == True,
-            Judge.court_id == case.court_id
-        ).all()
+        eligible_judge_ids = get_specialization_index(self.db).eligible_judge_ids(case.jurisdiction, case.court_id)
+        reference_cache = get_reference_cache()
+        eligible_judges = reference_cache.judges(
+            self.db, court_id=case.court_id, available_only=True, ids=eligible_judge_ids
+        )
         
         # Get available courtrooms
-        available_courtrooms = self.db.query(Courtroom).filter(
-            Courtroom.court_id == case.court_id,
-            Courtroom.is_available == True
-        ).all()
+        available_courtrooms = reference_cache.courtrooms(self.db, [case.court_id], available_only=True)
         
-        # Generate time slots for next 30 days (excluding weekends)
-        slots = []
-        start_date = datetime.now() + timedelta(days=constraints.get('min_advance_days', 7))
+        duration = timedelta(hours=case.estimated_duration_hours)
+        slot_times = []
+        cand_slot, cand_judge, cand_room = [], [], []
+        days = []
         
-        for day_offset in range(30):
+        for day_offset in range(SLOT_WINDOW_DAYS):
             current_date = start_date + timedelta(days=day_offset)
+            days.append(current_date.date())
             
             # Skip weekends
             if current_date.weekday() >= 5:
                 continue
             
             # Generate time slots (9 AM to 5 PM)
-            for hour in range(9, 17):
+            for hour in WORKING_HOURS:
                 slot_time = current_date.replace(hour=hour, minute=0, second=0, microsecond=0)
+                slot_end = slot_time + duration
+                
+                free_judges = [
+                    j for j, judge in enumerate(eligible_judges)
+                    if self.occupancy.is_free('judge', judge.id, slot_time, slot_end)
+                ]
+                if not free_judges:
+                    continue
+                
+                free_courtrooms = [
+                    r for r, courtroom in enumerate(available_courtrooms)
+                    if self.occupancy.is_free('courtroom', courtroom.id, slot_time, slot_end)
+                ]
+                if not free_courtrooms:
+                    continue
                 
-                for judge in eligible_judges:
-                    for courtroom in available_courtrooms:
-                        # Check for conflicts
-                        conflicts = self._check_conflicts(judge.id, courtroom.id, slot_time, case.estimated_duration_hours)
-                        
-                        if not conflicts:
-                            slots.append({
-                                'datetime': slot_time,
-                                'judge_id': judge.id,
-                                'judge_name': judge.user.full_name if judge.user else f"Judge {judge.id}",
-                                'courtroom_id': courtroom.id,
-                                'courtroom_name': courtroom.name,
-                                'estimated_duration': case.estimated_duration_hours,
-                                'priority_score': self._calculate_priority_score(case, judge, slot_time)
-                            })
-        
-        # Sort by priority score (higher is better)
-        slots.sort(key=lambda x: x['priority_score'], reverse=True)
-        return slots[:10]  # Return top 10 slots
-    
-    def _check_conflicts(self, judge_id: int, courtroom_id: int, start_time: datetime, duration_hours: float) -> List[str]:
-        """Check for scheduling conflicts"""
+                # Every free judge with every free courtroom, judge-major
+                cand_slot.append(np.full(len(free_judges) * len(free_courtrooms), len(slot_times), dtype=np.int32))
+                cand_judge.append(np.repeat(np.array(free_judges, dtype=np.int32), len(free_courtrooms)))
+                cand_room.append(np.tile(np.array(free_courtrooms, dtype=np.int32), len(free_judges)))
+                slot_times.append(slot_time)
+        
+        def concat(parts):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+        
+        return SlotCacheEntry(
+            court_id=case.court_id,
+            first_day=days[0],
+            last_day=days[-1] + timedelta(days=math.ceil(duration / timedelta(days=1))),
+            judge_ids=[judge.id for judge in eligible_judges],
+            courtroom_ids=[courtroom.id for courtroom in available_courtrooms],
+            data={
+                'slot_times': slot_times,
+                'slot_hours': np.array([slot_time.hour for slot_time in slot_times], dtype=np.int32),
+                'cand_slot': concat(cand_slot),
+                'cand_judge': concat(cand_judge),
+                'cand_room': concat(cand_room),
+                'judge_ids': np.array([judge.id for judge in eligible_judges], dtype=np.int64),
+                'judge_workloads': np.array([judge.current_workload or 0 for judge in eligible_judges], dtype=float),
+                'judge_names': [judge.full_name or f"Judge {judge.id}" for judge in eligible_judges],
+                'courtroom_ids': np.array([courtroom.id for courtroom in available_courtrooms], dtype=np.int64),
+                'courtroom_names': [courtroom.name for courtroom in available_courtrooms]
+            }
+        )
+    
+    def _check_conflicts(
+        self,
+        judge_id: int,
+        courtroom_id: int,
+        start_time: datetime,
+        duration_hours: float,
+        exclude_hearing_id: Optional[int] = None,
+        use_database: bool = False
+    ) -> List[str]:
+        """
+        Check for scheduling conflicts
+        Reads the in-process occupancy index unless use_database is set; write paths
+        use the database so hearings booked by other workers are never missed.
+        """
         conflicts = []
         end_time = start_time + timedelta(hours=duration_hours)
         
-        # Check judge conflicts
-        judge_hearings = self.db.query(Hearing).join(Case).filter(
-            Case.assigned_judge_id == judge_id,
-            Hearing.scheduled_date >= start_time,
-            Hearing.scheduled_date < end_time,
-            Hearing.status.in_(['scheduled', 'hearing'])
-        ).all()
+        if use_database:
+            overlapping = self._find_overlapping_hearings(start_time, end_time, judge_id, courtroom_id, exclude_hearing_id)
+            judge_hearings = [h_id for h_id, h_courtroom_id, h_judge_id in overlapping if h_judge_id == judge_id]
+            courtroom_hearings = [h_id for h_id, h_courtroom_id, h_judge_id in overlapping if h_courtroom_id == courtroom_id]
+        else:
+            judge_hearings = self.occupancy.conflicts('judge', judge_id, start_time, end_time, exclude_hearing_id)
+            courtroom_hearings = self.occupancy.conflicts('courtroom', courtroom_id, start_time, end_time, exclude_hearing_id)
         
+        # Check judge conflicts
         if judge_hearings:
             conflicts.append(f"Judge has {len(judge_hearings)} conflicting hearings")
         
         # Check courtroom conflicts
-        courtroom_hearings = self.db.query(Hearing).filter(
-            Hearing.courtroom_id == courtroom_id,
-            Hearing.scheduled_date >= start_time,
-            Hearing.scheduled_date < end_time,
-            Hearing.status.in_(['scheduled', 'hearing'])
-        ).all()
-        
         if courtroom_hearings:
             conflicts.append(f"Courtroom has {len(courtroom_hearings)} conflicting hearings")
         
         return conflicts
     
+    def _find_overlapping_hearings(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        judge_id: Optional[int] = None,
+        courtroom_id: Optional[int] = None,
+        exclude_hearing_id: Optional[int] = None
+    ):
+        """Single range-overlap lookup for active hearings of a judge or a courtroom"""
+        query = self.db.query(Hearing.id, Hearing.courtroom_id, Case.assigned_judge_id).join(Case).filter(
+            Hearing.overlaps(start_time, end_time),
+            Hearing.status.in_(ACTIVE_HEARING_STATUSES),
+            or_(Case.assigned_judge_id == judge_id, Hearing.courtroom_id == courtroom_id)
+        )
+        if exclude_hearing_id is not None:
+            query = query.filter(Hearing.id != exclude_hearing_id)
+        return query.all()
+    
     def _calculate_priority_score(self, case: Case, judge: Judge, slot_time: datetime) -> float:
-        """Calculate priority score for a slot"""
-        score = 0.0
-        
-        # Urgency factor
-        urgency_weights = {
-            'habeas_corpus': 10.0,
-            'bail': 8.0,
-            'injunction': 6.0,
-            'regular': 1.0
-        }
-        score += urgency_weights.get(case.urgency_level.value, 1.0)
-        
-        # Age factor (older cases get higher priority)
-        days_since_filing = (datetime.now() - case.filing_date).days
-        score += min(days_since_filing * 0.1, 5.0)
-        
-        # Public interest factor
-        score += case.public_interest_score * 0.5
+        """
+        Calculate priority score for a slot
+        Scalar reference for score_candidates, which find_available_slots uses
+        """
+        # Urgency, age and public interest factors
+        score = _case_base_score(case, datetime.now())
         
         # Judge workload factor (prefer judges with lower workload)
         score += max(0, 10 - judge.current_workload) * 0.3
@@ -131,8 +286,219 @@ class SchedulingEngine:
         
         return score
 
+class BatchSchedulingEngine:
+    """
+    Joint judge, courtroom and time assignment for a backlog of cases
+    Cases are placed in priority order on an hourly grid per court. Each placement scores
+    every free (judge, start slot) pair at once with NumPy, using the same weights as
+    SchedulingEngine._calculate_priority_score, and books the least used free courtroom.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def schedule(
+        self,
+        cases: List[Case],
+        min_advance_days: int = 7,
+        horizon_days: int = 30
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Plan hearings for the given cases; returns (assignments, unscheduled)"""
+        start_date = (datetime.now() + timedelta(days=min_advance_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        days = [
+            start_date + timedelta(days=offset)
+            for offset in range(horizon_days)
+            if (start_date + timedelta(days=offset)).weekday() < 5
+        ]
+        
+        recusals = set(self.db.query(JudgeRecusal.judge_id, JudgeRecusal.case_id).filter(
+            JudgeRecusal.case_id.in_([case.id for case in cases])
+        ).all())
+        
+        cases_by_court = defaultdict(list)
+        for case in cases:
+            cases_by_court[case.court_id].append(case)
+        
+        assignments = []
+        unscheduled = []
+        for court_id, court_cases in cases_by_court.items():
+            court_assignments, court_unscheduled = self._schedule_court(court_id, court_cases, days, recusals)
+            assignments.extend(court_assignments)
+            unscheduled.extend(court_unscheduled)
+        
+        assignments.sort(key=lambda x: (x['datetime'], x['courtroom_id']))
+        return assignments, unscheduled
+    
+    def _schedule_court(self, court_id: int, cases: List[Case], days: List[datetime], recusals: set):
+        reference_cache = get_reference_cache()
+        judges = reference_cache.judges(self.db, court_id=court_id, available_only=True)
+        courtrooms = reference_cache.courtrooms(self.db, [court_id], available_only=True)
+        
+        if not judges or not courtrooms or not days:
+            return [], [self._unscheduled(case, "No available judges, courtrooms or working days for the court") for case in cases]
+        
+        slots_per_day = len(WORKING_HOURS)
+        n_cells = len(days) * slots_per_day
+        cell_day = np.repeat(np.arange(len(days)), slots_per_day)
+        cell_offset = np.tile(np.arange(slots_per_day), len(days))
+        cell_hour = np.tile(np.array(WORKING_HOURS), len(days))
+        
+        judge_busy = np.zeros((len(judges), n_cells), dtype=bool)
+        room_busy = np.zeros((len(courtrooms), n_cells), dtype=bool)
+        self._mark_existing_hearings(days, judges, courtrooms, judge_busy, room_busy)
+        
+        judge_ids = np.array([judge.id for judge in judges])
+        judge_load = np.array([judge.current_workload or 0 for judge in judges], dtype=float)
+        specialization_index = get_specialization_index(self.db)
+        specialized = {}
+        
+        now = datetime.now()
+        ordered = sorted(cases, key=lambda case: _case_base_score(case, now), reverse=True)
+        
+        assignments = []
+        unscheduled = []
+        for case in ordered:
+            if case.jurisdiction not in specialized:
+                specialized[case.jurisdiction] = np.isin(
+                    judge_ids, specialization_index.eligible_judge_ids(case.jurisdiction, court_id)
+                )
+            eligible = specialized[case.jurisdiction] & np.array([
+                (judge.id, case.id) not in recusals for judge in judges
+            ])
+            if case.assigned_judge_id:
+                eligible &= judge_ids == case.assigned_judge_id
+            if not eligible.any():
+                unscheduled.append(self._unscheduled(case, "No eligible judge available"))
+                continue
+            
+            n_slots = min(slots_per_day, max(1, math.ceil(case.estimated_duration_hours or 1)))
+            fits_day = cell_offset + n_slots <= slots_per_day
+            judge_free = self._free_runs(judge_busy, n_slots) & fits_day
+            room_free = self._free_runs(room_busy, n_slots) & fits_day
+            
+            feasible = eligible[:, None] & judge_free & room_free.any(axis=0)[None, :]
+            if not feasible.any():
+                unscheduled.append(self._unscheduled(case, "No free judge and courtroom within the scheduling horizon"))
+                continue
+            
+            # Slot-dependent part of _calculate_priority_score for every (judge, start slot)
+            slot_scores = score_candidates(case, judge_load[:, None], cell_hour[None, :], now)
+            slot_scores = np.broadcast_to(slot_scores, feasible.shape)
+            ranked = np.where(feasible, slot_scores - cell_day[None, :] * BATCH_DAY_PENALTY, -np.inf)
+            
+            j, t = np.unravel_index(np.argmax(ranked), ranked.shape)
+            room_usage = np.where(room_free[:, t], room_busy.sum(axis=1), np.iinfo(np.int64).max)
+            r = int(np.argmin(room_usage))
+            
+            judge_busy[j, t:t + n_slots] = True
+            room_busy[r, t:t + n_slots] = True
+            judge_load[j] += 1
+            
+            judge = judges[j]
+            courtroom = courtrooms[r]
+            assignments.append({
+                'case_id': case.id,
+                'case_number': case.case_number,
+                'datetime': days[cell_day[t]].replace(hour=int(cell_hour[t])),
+                'judge_id': judge.id,
+                'judge_name': judge.full_name or f"Judge {judge.id}",
+                'courtroom_id': courtroom.id,
+                'courtroom_name': courtroom.name,
+                'estimated_duration': case.estimated_duration_hours,
+                'priority_score': round(float(slot_scores[j, t]), 2)
+            })
+        
+        return assignments, unscheduled
+    
+    def _mark_existing_hearings(self, days, judges, courtrooms, judge_busy, room_busy):
+        """Mark grid cells already taken by active hearings, loaded in one overlap query"""
+        judge_index = {judge.id: i for i, judge in enumerate(judges)}
+        room_index = {courtroom.id: i for i, courtroom in enumerate(courtrooms)}
+        day_index = {day.date(): i for i, day in enumerate(days)}
+        slots_per_day = len(WORKING_HOURS)
+        
+        rows = self.db.query(
+            Hearing.scheduled_date,
+            Hearing.scheduled_end,
+            Hearing.courtroom_id,
+            Case.assigned_judge_id
+        ).join(Case).filter(
+            Hearing.overlaps(days[0], days[-1] + timedelta(days=1)),
+            Hearing.status.in_(ACTIVE_HEARING_STATUSES),
+            or_(Case.assigned_judge_id.in_(list(judge_index)), Hearing.courtroom_id.in_(list(room_index)))
+        ).all()
+        
+        for start, end, courtroom_id, judge_id in rows:
+            current = start.date()
+            while current <= end.date():
+                d = day_index.get(current)
+                if d is not None:
+                    for offset, hour in enumerate(WORKING_HOURS):
+                        cell_start = datetime.combine(current, datetime.min.time()).replace(hour=hour)
+                        if cell_start < end and cell_start + timedelta(hours=1) > start:
+                            cell = d * slots_per_day + offset
+                            if judge_id in judge_index:
+                                judge_busy[judge_index[judge_id], cell] = True
+                            if courtroom_id in room_index:
+                                room_busy[room_index[courtroom_id], cell] = True
+                current += timedelta(days=1)
+    
+    @staticmethod
+    def _free_runs(busy: np.ndarray, n_slots: int) -> np.ndarray:
+        """True where n_slots consecutive cells starting at that cell are all free"""
+        counts = np.zeros((busy.shape[0], busy.shape[1] + 1), dtype=np.int64)
+        np.cumsum(busy, axis=1, out=counts[:, 1:])
+        free = np.zeros(busy.shape, dtype=bool)
+        n_starts = busy.shape[1] - n_slots + 1
+        if n_starts > 0:
+            free[:, :n_starts] = counts[:, n_slots:] == counts[:, :n_starts]
+        return free
+    
+    @staticmethod
+    def _unscheduled(case: Case, reason: str) -> Dict[str, Any]:
+        return {'case_id': case.id, 'case_number': case.case_number, 'reason': reason}
+    
+    def commit(self, assignments: List[Dict[str, Any]], cases: Dict[int, Case]):
+        """Write all planned hearings and case updates in one transaction"""
+        hearings = []
+        try:
+            for assignment in assignments:
+                case = cases[assignment['case_id']]
+                hearing = Hearing(
+                    case_id=case.id,
+                    courtroom_id=assignment['courtroom_id'],
+                    scheduled_date=assignment['datetime'],
+                    scheduled_duration_hours=case.estimated_duration_hours or 1.0,
+                    status="scheduled",
+                    notes="Scheduled by batch scheduler"
+                )
+                self.db.add(hearing)
+                hearings.append(hearing)
+                
+                if not case.assigned_judge_id:
+                    case.assigned_judge_id = assignment['judge_id']
+                if case.status == CaseStatus.ADMITTED:
+                    case.status = CaseStatus.LISTED
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for assignment, hearing in zip(assignments, hearings):
+            assignment['hearing_id'] = hearing.id
+        
+        # Many judges and courtrooms changed at once; rebuild on next use
+        get_occupancy_index().invalidate()
+        slot_cache = get_slot_cache()
+        for assignment in assignments:
+            slot_cache.invalidate_hearing(
+                "batch_schedule", assignment['judge_id'], assignment['courtroom_id'],
+                assignment['datetime'], assignment['estimated_duration']
+            )
+
 @router.post("/find-slots", response_model=SchedulingResponse)
-async def find_available_slots(
+def find_available_slots(
     request: SchedulingRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -148,7 +514,7 @@ async def find_available_slots(
     engine = SchedulingEngine(db)
     constraints_dict = request.constraints.dict()
     
-    suggested_slots = engine.find_available_slots(request.case_id, constraints_dict)
+    suggested_slots = engine.find_available_slots(request.case_id, constraints_dict, top_k=request.top_k)
     
     # Generate explanation
     explanation = f"Found {len(suggested_slots)} available slots for case {case.case_number}. "
@@ -163,8 +529,69 @@ async def find_available_slots(
         explanation=explanation
     )
 
+@router.post("/batch", response_model=BatchSchedulingResponse)
+def batch_schedule(
+    request: BatchSchedulingRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Jointly schedule a backlog of cases in one optimization run"""
+    if current_user.role not in ["chief_justice", "court_administrator", "scheduler"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    query = db.query(Case)
+    if request.case_ids:
+        query = query.filter(Case.id.in_(request.case_ids))
+    elif request.court_id:
+        query = query.filter(
+            Case.court_id == request.court_id,
+            Case.status.in_([status.value for status in request.statuses])
+        )
+    else:
+        raise HTTPException(status_code=400, detail="Provide case_ids or court_id")
+    
+    cases = {case.id: case for case in query.all()}
+    
+    unscheduled = [
+        {'case_id': case_id, 'case_number': None, 'reason': "Case not found"}
+        for case_id in (request.case_ids or []) if case_id not in cases
+    ]
+    
+    # Cases that already have an upcoming hearing are left alone
+    booked = {
+        case_id for (case_id,) in db.query(Hearing.case_id).filter(
+            Hearing.case_id.in_(list(cases)),
+            Hearing.status.in_(ACTIVE_HEARING_STATUSES),
+            Hearing.scheduled_end > datetime.now()
+        ).distinct().all()
+    }
+    for case_id in booked:
+        unscheduled.append({'case_id': case_id, 'case_number': cases[case_id].case_number, 'reason': "Case already has an upcoming hearing"})
+    
+    engine = BatchSchedulingEngine(db)
+    assignments, not_placed = engine.schedule(
+        [case for case_id, case in cases.items() if case_id not in booked],
+        min_advance_days=request.min_advance_days,
+        horizon_days=request.horizon_days
+    )
+    unscheduled.extend(not_placed)
+    
+    if assignments and not request.dry_run:
+        engine.commit(assignments, cases)
+    
+    explanation = f"Scheduled {len(assignments)} of {len(cases)} cases"
+    explanation += " (dry run, nothing written). " if request.dry_run else ". "
+    explanation += "Cases were placed in priority order (urgency, case age, public interest) "
+    explanation += "on the earliest free judge and courtroom, preferring lightly loaded judges."
+    
+    return BatchSchedulingResponse(
+        scheduled=assignments,
+        unscheduled=unscheduled,
+        explanation=explanation
+    )
+
 @router.post("/schedule-hearing", response_model=HearingResponse)
-async def schedule_hearing(
+def schedule_hearing(
     hearing: HearingCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -177,7 +604,7 @@ async def schedule_hearing(
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    courtroom = db.query(Courtroom).filter(Courtroom.id == hearing.courtroom_id).first()
+    courtroom = get_reference_cache().courtroom(db, hearing.courtroom_id)
     if not courtroom:
         raise HTTPException(status_code=404, detail="Courtroom not found")
     
@@ -187,7 +614,8 @@ async def schedule_hearing(
         case.assigned_judge_id or 0,
         hearing.courtroom_id,
         hearing.scheduled_date,
-        hearing.scheduled_duration_hours
+        hearing.scheduled_duration_hours,
+        use_database=True
     )
     
     if conflicts:
@@ -213,10 +641,16 @@ async def schedule_hearing(
     db.commit()
     db.refresh(db_hearing)
     
+    engine.occupancy.sync_hearing(db, db_hearing)
+    engine.slot_cache.invalidate_hearing(
+        "schedule_hearing", case.assigned_judge_id, db_hearing.courtroom_id,
+        db_hearing.scheduled_date, db_hearing.scheduled_duration_hours
+    )
+    
     return db_hearing
 
 @router.get("/conflicts/{case_id}")
-async def get_scheduling_conflicts(
+def get_scheduling_conflicts(
     case_id: int,
     proposed_date: datetime,
     duration_hours: float,
@@ -234,10 +668,9 @@ async def get_scheduling_conflicts(
     conflicts = []
     
     # Get eligible judges
-    eligible_judges = db.query(Judge).filter(
-        Judge.specializations.contains([case.jurisdiction]),
-        Judge.court_id == case.court_id
-    ).all()
+    eligible_judge_ids = get_specialization_index(db).eligible_judge_ids(case.jurisdiction, case.court_id)
+    reference_cache = get_reference_cache()
+    eligible_judges = reference_cache.judges(db, court_id=case.court_id, ids=eligible_judge_ids)
     
     for judge in eligible_judges:
         judge_conflicts = engine._check_conflicts(
@@ -247,12 +680,12 @@ async def get_scheduling_conflicts(
             conflicts.append({
                 'type': 'judge',
                 'judge_id': judge.id,
-                'judge_name': judge.user.full_name if judge.user else f"Judge {judge.id}",
+                'judge_name': judge.full_name or f"Judge {judge.id}",
                 'conflicts': judge_conflicts
             })
     
     # Check courtroom conflicts
-    courtrooms = db.query(Courtroom).filter(Courtroom.court_id == case.court_id).all()
+    courtrooms = reference_cache.courtrooms(db, [case.court_id])
     
     for courtroom in courtrooms:
         courtroom_conflicts = engine._check_conflicts(
@@ -275,7 +708,7 @@ async def get_scheduling_conflicts(
     }
 
 @router.post("/reschedule/{hearing_id}")
-async def reschedule_hearing(
+def reschedule_hearing(
     hearing_id: int,
     new_date: datetime,
     reason: str,
@@ -297,7 +730,9 @@ async def reschedule_hearing(
         case.assigned_judge_id or 0,
         hearing.courtroom_id,
         new_date,
-        hearing.scheduled_duration_hours
+        hearing.scheduled_duration_hours,
+        exclude_hearing_id=hearing.id,
+        use_database=True
     )
     
     if conflicts:
@@ -307,16 +742,66 @@ async def reschedule_hearing(
         )
     
     # Update hearing
+    old_date = hearing.scheduled_date
     hearing.scheduled_date = new_date
     hearing.adjournment_reason = reason
     hearing.notes = f"Rescheduled by {current_user.full_name} on {datetime.now()}"
     
     db.commit()
     
+    engine.occupancy.sync_hearing(db, hearing)
+    for start in (old_date, new_date):
+        engine.slot_cache.invalidate_hearing(
+            "reschedule_hearing", case.assigned_judge_id, hearing.courtroom_id,
+            start, hearing.scheduled_duration_hours
+        )
+    
     return {"message": "Hearing rescheduled successfully"}
 
+@router.post("/cancel/{hearing_id}")
+def cancel_hearing(
+    hearing_id: int,
+    reason: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cancel a scheduled hearing and release its judge, courtroom and lawyers"""
+    if current_user.role not in ["chief_justice", "court_administrator", "scheduler"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    hearing = db.query(Hearing).filter(Hearing.id == hearing_id).first()
+    if not hearing:
+        raise HTTPException(status_code=404, detail="Hearing not found")
+    
+    if hearing.status not in ACTIVE_HEARING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Hearing is already {hearing.status}")
+    
+    hearing.status = "cancelled"
+    hearing.adjournment_reason = reason
+    hearing.notes = f"Cancelled by {current_user.full_name} on {datetime.now()}"
+    
+    db.commit()
+    
+    get_occupancy_index().remove_hearing(hearing_id)
+    get_slot_cache().invalidate_hearing(
+        "cancel_hearing", hearing.case.assigned_judge_id, hearing.courtroom_id,
+        hearing.scheduled_date, hearing.scheduled_duration_hours
+    )
+    
+    return {"message": "Hearing cancelled successfully"}
+
+@router.get("/slot-cache/stats")
+async def get_slot_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Hit, miss and invalidation counters of the slot search cache"""
+    if current_user.role not in ["chief_justice", "court_administrator", "scheduler"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    return get_slot_cache().stats()
+
 @router.get("/optimization-report")
-async def get_scheduling_optimization_report(
+def get_scheduling_optimization_report(
     court_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -341,11 +826,36 @@ async def get_scheduling_optimization_report(
     ) if filed_cases else 0
     avg_delay_days = total_delay_days / len(filed_cases) if filed_cases else 0
     
+    # Courtroom utilization over the coming weeks, read from the daily rollup
+    window_start = datetime.now().date()
+    window_end = window_start + timedelta(days=UTILIZATION_WINDOW_DAYS)
+    rollup_query = db.query(
+        func.coalesce(func.sum(CourtroomDailyUtilization.scheduled_hours), 0.0),
+        func.count(CourtroomDailyUtilization.day)
+    ).filter(
+        CourtroomDailyUtilization.day >= window_start,
+        CourtroomDailyUtilization.day < window_end
+    )
+    if court_id:
+        rollup_query = rollup_query.filter(CourtroomDailyUtilization.court_id == court_id)
+    courtrooms = get_reference_cache().courtrooms(db, [court_id] if court_id else None)
+    scheduled_hours, courtroom_days_in_use = rollup_query.one()
+    
+    working_days = sum(1 for offset in range(UTILIZATION_WINDOW_DAYS) if (window_start + timedelta(days=offset)).weekday() < 5)
+    capacity_hours = len(courtrooms) * working_days * HOURS_PER_COURTROOM_DAY
+    
     return {
         "court_id": court_id,
         "total_cases": total_cases,
         "pending_cases": pending_cases,
         "average_delay_days": avg_delay_days,
+        "courtroom_utilization": {
+            "window_days": UTILIZATION_WINDOW_DAYS,
+            "scheduled_hours": scheduled_hours,
+            "capacity_hours": capacity_hours,
+            "utilization_percentage": round(scheduled_hours / capacity_hours * 100, 1) if capacity_hours else 0,
+            "courtroom_days_in_use": courtroom_days_in_use
+        },
         "optimization_suggestions": [
             "AI/ML PLACEHOLDER: ML-based optimization suggestions will be implemented",
             "Current basic metrics show system status",
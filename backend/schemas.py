@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -69,6 +69,14 @@ class CourtBase(BaseModel):
 class CourtCreate(CourtBase):
     pass
 
+class CourtUpdate(BaseModel):
+    name: Optional[str] = None
+    level: Optional[CourtLevelEnum] = None
+    jurisdiction: Optional[JurisdictionEnum] = None
+    location: Optional[str] = None
+    parent_court_id: Optional[int] = None
+    is_active: Optional[bool] = None
+
 class CourtResponse(CourtBase):
     id: int
     is_active: bool
@@ -138,6 +146,23 @@ class CaseResponse(CaseBase):
     class Config:
         from_attributes = True
 
+class BulkStatusUpdate(BaseModel):
+    case_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    new_status: CaseStatusEnum
+    expected_status: Optional[CaseStatusEnum] = None  # only move cases currently in this status
+    notes: Optional[str] = None
+    all_or_nothing: bool = False  # reject the whole batch if any case cannot be moved
+
+class BulkStatusResult(BaseModel):
+    case_id: int
+    result: str  # updated, unchanged, skipped, not_found, forbidden
+    old_status: Optional[CaseStatusEnum] = None
+    new_status: Optional[CaseStatusEnum] = None
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    results: List[BulkStatusResult]
+
 class HearingBase(BaseModel):
     case_id: int
     courtroom_id: int
@@ -191,6 +216,7 @@ class SchedulingRequest(BaseModel):
     case_id: int
     constraints: SchedulingConstraints
     priority_weight: float = 1.0
+    top_k: int = Field(10, ge=1, le=500)  # number of suggested slots to return
 
 class SchedulingResponse(BaseModel):
     case_id: int
@@ -198,6 +224,19 @@ class SchedulingResponse(BaseModel):
     conflicts: List[Dict[str, Any]]
     explanation: str
 
+class BatchSchedulingRequest(BaseModel):
+    case_ids: Optional[List[int]] = None  # explicit cases, or all cases of court_id in statuses
+    court_id: Optional[int] = None
+    statuses: List[CaseStatusEnum] = [CaseStatusEnum.ADMITTED, CaseStatusEnum.LISTED]
+    min_advance_days: int = 7
+    horizon_days: int = 30
+    dry_run: bool = False
+
+class BatchSchedulingResponse(BaseModel):
+    scheduled: List[Dict[str, Any]]
+    unscheduled: List[Dict[str, Any]]
+    explanation: str
+
 # Calendar schemas
 class CalendarSlot(BaseModel):
     date: datetime
@@ -0,0 +1,165 @@
+"""
+Slot Cache
+In-process cache of free-slot sets computed by SchedulingEngine.find_available_slots.
+Entries are keyed by (court_id, jurisdiction, window start, duration) and dropped precisely
+when a hearing, judge availability or recusal change touches one of their judges,
+courtrooms or days.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+MAX_ENTRIES = int(os.getenv("SLOT_CACHE_MAX_ENTRIES", "256"))
+
+# Entries also expire so hearings booked by other worker processes are picked up
+TTL_SECONDS = int(os.getenv("SLOT_CACHE_TTL_SECONDS", "60"))
+
+
+class SlotCacheEntry:
+    """Free (slot, judge, courtroom) candidates for one court, jurisdiction and date window"""
+
+    def __init__(
+        self,
+        court_id: int,
+        first_day: date,
+        last_day: date,
+        judge_ids: Iterable[int],
+        courtroom_ids: Iterable[int],
+        data: Dict[str, Any]
+    ):
+        self.court_id = court_id
+        self.first_day = first_day
+        self.last_day = last_day
+        self.judge_ids = frozenset(judge_ids)
+        self.courtroom_ids = frozenset(courtroom_ids)
+        self.data = data
+        self.created_at = time.monotonic()
+
+    def covers(self, days: Optional[Iterable[date]]) -> bool:
+        if days is None:
+            return True
+        return any(self.first_day <= day <= self.last_day for day in days)
+
+
+class SlotCache:
+    """LRU cache of slot search results with dependency-based invalidation and counters"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: int = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, SlotCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.invalidated_entries = 0
+        self.invalidation_events = Counter()
+
+    def get(self, key: Hashable) -> Optional[SlotCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: SlotCacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def invalidate(
+        self,
+        reason: str,
+        judge_ids: Iterable[Optional[int]] = (),
+        courtroom_ids: Iterable[Optional[int]] = (),
+        court_id: Optional[int] = None,
+        days: Optional[Iterable[date]] = None
+    ) -> int:
+        """
+        Drop entries that depend on any of the given judges or courtrooms (or on the
+        whole court) and whose window covers one of the given days (or any day if None)
+        """
+        judge_ids = {judge_id for judge_id in judge_ids if judge_id}
+        courtroom_ids = {courtroom_id for courtroom_id in courtroom_ids if courtroom_id}
+        days = list(days) if days is not None else None
+
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if (
+                    (court_id is not None and entry.court_id == court_id)
+                    or entry.judge_ids & judge_ids
+                    or entry.courtroom_ids & courtroom_ids
+                ) and entry.covers(days)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidated_entries += len(stale)
+            self.invalidation_events[reason] += 1
+            return len(stale)
+
+    def invalidate_hearing(
+        self,
+        reason: str,
+        judge_id: Optional[int],
+        courtroom_id: Optional[int],
+        start: datetime,
+        duration_hours: Optional[float]
+    ) -> int:
+        """Drop entries touched by a hearing occupying [start, start + duration)"""
+        end = start + timedelta(hours=duration_hours or 0)
+        days = [start.date() + timedelta(days=offset) for offset in range((end.date() - start.date()).days + 1)]
+        return self.invalidate(reason, judge_ids=[judge_id], courtroom_ids=[courtroom_id], days=days)
+
+    def clear(self, reason: str = "clear"):
+        with self._lock:
+            self.invalidated_entries += len(self._entries)
+            self._entries.clear()
+            self.invalidation_events[reason] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "invalidated_entries": self.invalidated_entries,
+                "invalidation_events": dict(self.invalidation_events)
+            }
+
+
+# Global slot cache instance
+slot_cache = None
+
+def get_slot_cache() -> SlotCache:
+    """
+    Get or create the slot cache (singleton pattern)
+
+    Returns:
+        SlotCache instance
+    """
+    global slot_cache
+    if slot_cache is None:
+        slot_cache = SlotCache()
+    return slot_cache
@@ -0,0 +1,144 @@
+"""
+Specialization Index
+In-process bitmaps of judges by jurisdiction, court and availability. Bit n of a mask is
+set when the judge with id n qualifies, so judge eligibility for a case is two ANDs on
+integers instead of a JSON containment scan over the judges table.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import String, cast
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import type_coerce
+
+from models import Judge
+
+# Full reloads pick up judges created by other worker processes
+REFRESH_SECONDS = int(os.getenv("SPECIALIZATION_INDEX_REFRESH_SECONDS", "60"))
+
+
+def _key(jurisdiction) -> str:
+    """Jurisdiction enum or plain string as stored in specializations"""
+    return getattr(jurisdiction, "value", jurisdiction)
+
+def _ids(mask: int) -> List[int]:
+    """Set bits of a mask, lowest first"""
+    ids = []
+    while mask:
+        lowest = mask & -mask
+        ids.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return ids
+
+def specializations_contain(db: Session, column, value):
+    """
+    SQL predicate for "the specializations array contains value". Uses JSONB @> on
+    Postgres, which the GIN index serves; elsewhere matches the quoted element in the JSON text.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return type_coerce(column, JSONB).contains([_key(value)])
+    return cast(column, String).like(f'%"{_key(value)}"%')
+
+
+class SpecializationIndex:
+    """Judge id bitmaps per jurisdiction and court, plus the bitmap of available judges"""
+
+    def __init__(self, refresh_seconds: int = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._by_jurisdiction: Dict[str, int] = {}
+        self._by_court: Dict[int, int] = {}
+        self._available = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def ensure_loaded(self, db: Session):
+        """Load the index on first use and reload it once it is older than refresh_seconds"""
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.refresh_seconds:
+            self.load(db)
+
+    def load(self, db: Session):
+        """Rebuild the bitmaps from the judges table"""
+        judges = db.query(Judge.id, Judge.court_id, Judge.specializations, Judge.is_available).all()
+        with self._lock:
+            self._reset()
+            for judge_id, court_id, specializations, is_available in judges:
+                self._add(judge_id, court_id, specializations or [], is_available)
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on next use"""
+        with self._lock:
+            self.loaded_at = None
+
+    def _add(self, judge_id: int, court_id: Optional[int], specializations: Iterable, is_available: Optional[bool]):
+        bit = 1 << judge_id
+        for jurisdiction in specializations:
+            key = _key(jurisdiction)
+            self._by_jurisdiction[key] = self._by_jurisdiction.get(key, 0) | bit
+        if court_id is not None:
+            self._by_court[court_id] = self._by_court.get(court_id, 0) | bit
+        # Judges default to available when the flag is unset
+        if is_available is not False:
+            self._available |= bit
+
+    def add_judge(self, judge: Judge):
+        """Index a newly created judge"""
+        if not self.is_loaded:
+            return
+        with self._lock:
+            self._add(judge.id, judge.court_id, judge.specializations or [], judge.is_available)
+
+    def set_available(self, judge_id: int, is_available: bool):
+        """Track an availability change"""
+        if not self.is_loaded:
+            return
+        with self._lock:
+            if is_available:
+                self._available |= 1 << judge_id
+            else:
+                self._available &= ~(1 << judge_id)
+
+    def eligible_judge_ids(
+        self,
+        jurisdiction,
+        court_id: Optional[int] = None,
+        available_only: bool = False
+    ) -> List[int]:
+        """Ids of judges specialized in a jurisdiction, optionally within a court and available"""
+        with self._lock:
+            mask = self._by_jurisdiction.get(_key(jurisdiction), 0)
+            if court_id is not None:
+                mask &= self._by_court.get(court_id, 0)
+            if available_only:
+                mask &= self._available
+        return _ids(mask)
+
+
+# Global specialization index instance
+specialization_index = None
+
+def get_specialization_index(db: Optional[Session] = None) -> SpecializationIndex:
+    """
+    Get or create the specialization index (singleton pattern)
+
+    Args:
+        db: Session used to (re)load the index when it is missing or stale.
+            Write paths omit it and only update an index that is already loaded.
+    """
+    global specialization_index
+    if specialization_index is None:
+        specialization_index = SpecializationIndex()
+    if db is not None:
+        specialization_index.ensure_loaded(db)
+    return specialization_index
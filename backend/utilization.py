@@ -0,0 +1,204 @@
+"""
+Courtroom Daily Utilization
+Maintains the courtroom_daily_utilization rollup: scheduled hours, hearing count and
+dominant judge per (court, courtroom, day). Hearing and case-judge writes are collected
+on the session at flush time and the affected rows are recomputed in the same
+transaction, just before commit.
+
+Backfill history (from the backend directory):
+    python utilization.py [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from models import Case, Courtroom, CourtroomDailyUtilization, Hearing
+
+# Scheduled hours one courtroom can hold per working day
+HOURS_PER_COURTROOM_DAY = 8
+
+# Hearings in these states no longer occupy their courtroom
+EXCLUDED_HEARING_STATUSES = ['cancelled']
+
+_PENDING_DAYS = "utilization_pending_days"
+_PENDING_CASES = "utilization_pending_cases"
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _counted_hearings():
+    return or_(Hearing.status.is_(None), Hearing.status.notin_(EXCLUDED_HEARING_STATUSES))
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+def utilization_query(start_day: date, end_day: date, court_id: Optional[int] = None):
+    """Rollup rows for days in [start_day, end_day], usable with sync and async sessions"""
+    query = select(CourtroomDailyUtilization).where(
+        CourtroomDailyUtilization.day >= start_day,
+        CourtroomDailyUtilization.day <= end_day
+    )
+    if court_id:
+        query = query.where(CourtroomDailyUtilization.court_id == court_id)
+    return query
+
+def _apply_summary(row: CourtroomDailyUtilization, hearings: List[Tuple]):
+    """Fill a rollup row from (scheduled_date, duration, case_id, judge_id) tuples ordered by time"""
+    judge_hours = defaultdict(float)
+    total_hours = 0.0
+    for _, duration, _, judge_id in hearings:
+        total_hours += duration or 0
+        if judge_id is not None:
+            judge_hours[judge_id] += duration or 0
+
+    row.scheduled_hours = total_hours
+    row.hearing_count = len(hearings)
+    row.first_case_id = hearings[0][2]
+    # Most hours wins; the lower judge id breaks ties so the result is stable
+    row.dominant_judge_id = min(judge_hours, key=lambda judge_id: (-judge_hours[judge_id], judge_id)) if judge_hours else None
+    row.judge_hours = {str(judge_id): hours for judge_id, hours in judge_hours.items()}
+
+def recompute(db: Session, courtroom_id: int, day: date):
+    """Rebuild the rollup row of one courtroom-day from its hearings"""
+    hearings = db.query(
+        Hearing.scheduled_date,
+        Hearing.scheduled_duration_hours,
+        Hearing.case_id,
+        Case.assigned_judge_id
+    ).outerjoin(Case, Hearing.case_id == Case.id).filter(
+        Hearing.courtroom_id == courtroom_id,
+        Hearing.scheduled_date >= _day_start(day),
+        Hearing.scheduled_date < _day_start(day) + timedelta(days=1),
+        _counted_hearings()
+    ).order_by(Hearing.scheduled_date, Hearing.id).all()
+
+    row = db.get(CourtroomDailyUtilization, (courtroom_id, day))
+    if not hearings:
+        if row is not None:
+            db.delete(row)
+        return
+
+    if row is None:
+        court_id = db.query(Courtroom.court_id).filter(Courtroom.id == courtroom_id).scalar()
+        row = CourtroomDailyUtilization(courtroom_id=courtroom_id, day=day, court_id=court_id)
+        db.add(row)
+    _apply_summary(row, hearings)
+
+def _hearing_days(hearing: Hearing) -> Set[Tuple[int, date]]:
+    """(courtroom, day) pairs a hearing occupies now or occupied before this flush"""
+    state = inspect(hearing)
+    courtroom_ids = {hearing.courtroom_id, *state.attrs.courtroom_id.history.deleted}
+    start_times = {hearing.scheduled_date, *state.attrs.scheduled_date.history.deleted}
+    return {
+        (courtroom_id, start.date())
+        for courtroom_id in courtroom_ids if courtroom_id is not None
+        for start in start_times if start is not None
+    }
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context):
+    pending_days = session.info.setdefault(_PENDING_DAYS, set())
+    pending_cases = session.info.setdefault(_PENDING_CASES, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Hearing):
+            pending_days |= _hearing_days(obj)
+        elif isinstance(obj, Case) and obj not in session.new and inspect(obj).attrs.assigned_judge_id.history.has_changes():
+            # Every hearing of the case changes judge attribution
+            pending_cases.add(obj.id)
+
+@event.listens_for(Session, "before_commit")
+def _refresh_rollup(session: Session):
+    # Sessions run with autoflush off; flush so pending hearing writes are collected and visible
+    session.flush()
+    pending_days = session.info.pop(_PENDING_DAYS, set())
+    pending_cases = session.info.pop(_PENDING_CASES, set())
+    if pending_cases:
+        pending_days |= {
+            (courtroom_id, scheduled_date.date())
+            for courtroom_id, scheduled_date in session.query(Hearing.courtroom_id, Hearing.scheduled_date).filter(
+                Hearing.case_id.in_(pending_cases),
+                Hearing.courtroom_id.isnot(None),
+                Hearing.scheduled_date.isnot(None)
+            ).all()
+        }
+    for courtroom_id, day in sorted(pending_days):
+        recompute(session, courtroom_id, day)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    session.info.pop(_PENDING_DAYS, None)
+    session.info.pop(_PENDING_CASES, None)
+
+def backfill(db: Session, start_day: Optional[date] = None, end_day: Optional[date] = None) -> int:
+    """Rebuild the rollup for a day range (all history by default); returns rows written"""
+    delete_query = db.query(CourtroomDailyUtilization)
+    hearing_query = db.query(
+        Hearing.courtroom_id,
+        Hearing.scheduled_date,
+        Hearing.scheduled_duration_hours,
+        Hearing.case_id,
+        Case.assigned_judge_id
+    ).outerjoin(Case, Hearing.case_id == Case.id).filter(
+        Hearing.courtroom_id.isnot(None),
+        Hearing.scheduled_date.isnot(None),
+        _counted_hearings()
+    )
+    if start_day:
+        delete_query = delete_query.filter(CourtroomDailyUtilization.day >= start_day)
+        hearing_query = hearing_query.filter(Hearing.scheduled_date >= _day_start(start_day))
+    if end_day:
+        delete_query = delete_query.filter(CourtroomDailyUtilization.day <= end_day)
+        hearing_query = hearing_query.filter(Hearing.scheduled_date < _day_start(end_day) + timedelta(days=1))
+
+    court_ids: Dict[int, int] = dict(db.query(Courtroom.id, Courtroom.court_id).all())
+    delete_query.delete(synchronize_session=False)
+
+    rows: List[CourtroomDailyUtilization] = []
+
+    def flush_group(key, hearings):
+        courtroom_id, day = key
+        row = CourtroomDailyUtilization(courtroom_id=courtroom_id, day=day, court_id=court_ids.get(courtroom_id))
+        _apply_summary(row, hearings)
+        rows.append(row)
+
+    # Rows arrive grouped by courtroom and day, so each group is finished when the key changes
+    current_key, group = None, []
+    ordered = hearing_query.order_by(Hearing.courtroom_id, Hearing.scheduled_date, Hearing.id).yield_per(BACKFILL_BATCH_SIZE)
+    for courtroom_id, scheduled_date, duration, case_id, judge_id in ordered:
+        key = (courtroom_id, scheduled_date.date())
+        if key != current_key and group:
+            flush_group(current_key, group)
+            group = []
+        current_key = key
+        group.append((scheduled_date, duration, case_id, judge_id))
+    if group:
+        flush_group(current_key, group)
+
+    # One row per courtroom-day, so the rollup itself stays small enough to write at once
+    db.add_all(rows)
+    db.commit()
+    return len(rows)
+
+def _parse_day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Backfill the courtroom_daily_utilization rollup")
+    parser.add_argument("--start", type=_parse_day, help="first day to rebuild (default: all history)")
+    parser.add_argument("--end", type=_parse_day, help="last day to rebuild (default: all future hearings)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = backfill(db, args.start, args.end)
+        print(f"Wrote {written} courtroom-day rows")
+    finally:
+        db.close()
@@ -0,0 +1,190 @@
+"""
+Judge Workload Counters
+Maintains judge_workload (active cases, estimated hours and active cases per urgency
+level) and judges.current_workload. Case inserts, judge assignments, transfers and status
+changes are turned into per-judge deltas at flush time and applied as atomic increments
+in the same transaction, so concurrent writers never overwrite each other's counts.
+
+Rebuild every counter from the cases table (from the backend directory):
+    python workload.py
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from models import Case, Judge, JudgeWorkload
+
+# Cases in these states count towards their judge's workload
+ACTIVE_CASE_STATUSES = ['admitted', 'listed', 'hearing', 'reserved']
+
+# Counter column per urgency level
+URGENCY_COLUMNS = {
+    'habeas_corpus': 'habeas_corpus_cases',
+    'bail': 'bail_cases',
+    'injunction': 'injunction_cases',
+    'regular': 'regular_cases'
+}
+
+COUNTED_ATTRIBUTES = ('assigned_judge_id', 'status', 'urgency_level', 'estimated_duration_hours')
+
+
+def _plain(value):
+    return getattr(value, "value", value)
+
+def _contribution(judge_id, status, urgency, hours) -> Optional[Tuple[int, Counter]]:
+    """(judge, counters) a case adds to its judge's workload, or None if it adds nothing"""
+    if judge_id is None or _plain(status) not in ACTIVE_CASE_STATUSES:
+        return None
+    counts = Counter(active_cases=1, estimated_hours=hours or 0.0)
+    urgency_column = URGENCY_COLUMNS.get(_plain(urgency))
+    if urgency_column:
+        counts[urgency_column] = 1
+    return judge_id, counts
+
+def _current(case: Case) -> Optional[Tuple[int, Counter]]:
+    return _contribution(case.assigned_judge_id, case.status, case.urgency_level, case.estimated_duration_hours)
+
+def _previous(case: Case) -> Optional[Tuple[int, Counter]]:
+    """Contribution as of the last flush, read from attribute history"""
+    state = inspect(case)
+    values = []
+    for name in COUNTED_ATTRIBUTES:
+        history = state.attrs[name].history
+        values.append(history.deleted[0] if history.deleted else getattr(case, name))
+    return _contribution(*values)
+
+def workload_breakdown(row: Optional[JudgeWorkload]) -> Dict:
+    """Counters of a judge_workload row in the shape the workload endpoints return"""
+    if row is None:
+        return {"total_active_cases": 0, "total_estimated_hours": 0.0, "urgency_breakdown": {}}
+    urgency_breakdown = {
+        urgency: getattr(row, column)
+        for urgency, column in URGENCY_COLUMNS.items()
+        if getattr(row, column)
+    }
+    return {
+        "total_active_cases": row.active_cases or 0,
+        "total_estimated_hours": row.estimated_hours or 0.0,
+        "urgency_breakdown": urgency_breakdown
+    }
+
+def _apply_deltas(session: Session, deltas: Dict[int, Counter]):
+    workload = JudgeWorkload.__table__
+    judges = Judge.__table__
+    for judge_id, delta in sorted(deltas.items()):
+        changes = {column: value for column, value in delta.items() if value}
+        if not changes:
+            continue
+        result = session.execute(
+            workload.update().where(workload.c.judge_id == judge_id).values(
+                {column: func.coalesce(workload.c[column], 0) + value for column, value in changes.items()}
+                | {"updated_at": datetime.utcnow()}
+            )
+        )
+        if result.rowcount == 0:
+            session.execute(workload.insert().values(judge_id=judge_id, **changes))
+        if changes.get("active_cases"):
+            session.execute(
+                judges.update().where(judges.c.id == judge_id).values(
+                    current_workload=func.coalesce(judges.c.current_workload, 0) + changes["active_cases"]
+                )
+            )
+
+def apply_status_changes(session: Session, cases, new_status):
+    """
+    Count a bulk status change written with a Core UPDATE, which the flush hook never sees.
+    `cases` holds (assigned_judge_id, status, urgency_level, estimated_duration_hours)
+    as they were before the update.
+    """
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for judge_id, status, urgency, hours in cases:
+        before = _contribution(judge_id, status, urgency, hours)
+        after = _contribution(judge_id, new_status, urgency, hours)
+        if before == after:
+            continue
+        if before:
+            deltas[before[0]].subtract(before[1])
+        if after:
+            deltas[after[0]].update(after[1])
+    if deltas:
+        _apply_deltas(session, deltas)
+
+# Load the previous value when a counted attribute is set on an unloaded case,
+# so the flush always sees what the case contributed before
+for _name in COUNTED_ATTRIBUTES:
+    event.listen(getattr(Case, _name), "set", lambda target, value, oldvalue, initiator: value,
+                 active_history=True, retval=True)
+
+@event.listens_for(Judge, "after_insert")
+def _create_counters(mapper, connection, judge: Judge):
+    connection.execute(JudgeWorkload.__table__.insert().values(judge_id=judge.id))
+
+@event.listens_for(Session, "after_flush")
+def _count_case_changes(session: Session, flush_context):
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Case):
+            continue
+        before = None if obj in session.new else _previous(obj)
+        after = None if obj in session.deleted else _current(obj)
+        if before == after:
+            continue
+        if before:
+            deltas[before[0]].subtract(before[1])
+        if after:
+            deltas[after[0]].update(after[1])
+    if deltas:
+        _apply_deltas(session, deltas)
+
+def rebuild(db: Session) -> int:
+    """Recompute every judge's counters from the cases table; returns judges written"""
+    rows = db.query(
+        Case.assigned_judge_id,
+        Case.urgency_level,
+        func.count(Case.id),
+        func.coalesce(func.sum(Case.estimated_duration_hours), 0.0)
+    ).filter(
+        Case.assigned_judge_id.isnot(None),
+        Case.status.in_(ACTIVE_CASE_STATUSES)
+    ).group_by(Case.assigned_judge_id, Case.urgency_level).all()
+
+    counters: Dict[int, Counter] = defaultdict(Counter)
+    for judge_id, urgency, count, hours in rows:
+        counters[judge_id]["active_cases"] += count
+        counters[judge_id]["estimated_hours"] += hours
+        urgency_column = URGENCY_COLUMNS.get(_plain(urgency))
+        if urgency_column:
+            counters[judge_id][urgency_column] += count
+
+    judge_ids = [judge_id for (judge_id,) in db.query(Judge.id).all()]
+    db.query(JudgeWorkload).delete(synchronize_session=False)
+    db.add_all([
+        JudgeWorkload(
+            judge_id=judge_id,
+            active_cases=counters[judge_id]["active_cases"],
+            estimated_hours=counters[judge_id]["estimated_hours"],
+            **{column: counters[judge_id][column] for column in URGENCY_COLUMNS.values()}
+        )
+        for judge_id in judge_ids
+    ])
+    for judge_id in judge_ids:
+        db.query(Judge).filter(Judge.id == judge_id).update(
+            {Judge.current_workload: counters[judge_id]["active_cases"]}, synchronize_session=False
+        )
+    db.commit()
+    return len(judge_ids)
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        written = rebuild(db)
+        print(f"Rebuilt workload counters for {written} judges")
+    finally:
+        db.close()
@@ -0,0 +1,120 @@
+"""
+Load benchmark: concurrent throughput of the read-heavy API endpoints
+Fires a fixed number of authenticated requests per endpoint with N requests in flight
+and reports requests/second and latency percentiles. Run it once against a server on
+the old revision with --save before.json and once on the new revision with
+--compare before.json to get a side-by-side comparison.
+
+Usage:
+    python benchmark_load.py [--base-url URL] [--concurrency N] [--requests N]
+                             [--save FILE] [--compare FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+def build_endpoints():
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    return {
+        "heatmap (quarter)": f"/api/calendar/heatmap?start_date={today}&end_date={today + timedelta(days=90)}",
+        "day view": f"/api/calendar/day-view?target_date={today}",
+        "week view": f"/api/calendar/week-view?week_start={monday}",
+        "upcoming hearings": "/api/calendar/upcoming-hearings?days_ahead=30",
+        "courts": "/api/courts/",
+        "court statistics": "/api/courts/statistics",
+        "cases": "/api/cases/",
+    }
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/auth/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+async def run_endpoint(client: httpx.AsyncClient, url: str, total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            t0 = time.perf_counter()
+            try:
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "req_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--email", default="admin@court.gov")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--save", help="write results to a JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        token = await login(client, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}, {args.base_url}\n")
+        results = {}
+        for name, url in build_endpoints().items():
+            await client.get(url)  # warm up caches and connections
+            results[name] = await run_endpoint(client, url, args.requests, args.concurrency)
+
+    before = {}
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)
+
+    header = f"{'endpoint':<20} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}"
+    if before:
+        header += f" {'before':>8} {'speedup':>8}"
+    print(header)
+    for name, result in results.items():
+        line = f"{name:<20} {result['req_per_sec']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8} {result['errors']:>7}"
+        if name in before:
+            line += f" {before[name]['req_per_sec']:>8} {result['req_per_sec'] / before[name]['req_per_sec']:>7.2f}x"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if any(result["errors"] for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark: workload rebalancing plan for a large court
+Builds a synthetic court of judges with skewed active-case loads, specializations and
+recusals, plans transfers with rebalancing.plan_transfers and checks that the plan
+respects every constraint, lowers the load variance and finishes within a second.
+
+Run from the project root: python benchmark_rebalancing.py [num_judges] [num_cases] [max_transfers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Planning needs no database; keep the import from connecting to one
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from rebalancing import JURISDICTIONS, plan_transfers
+
+NUM_JUDGES = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+NUM_CASES = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+MAX_TRANSFERS = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+NUM_RECUSALS = 20_000
+TIME_BUDGET_SECONDS = 1.0
+
+def build_court(rng: np.random.Generator):
+    judge_ids = np.arange(1, NUM_JUDGES + 1)
+    # Every judge covers one or two jurisdictions; 5% are unavailable
+    receivable = np.zeros((NUM_JUDGES, len(JURISDICTIONS)), dtype=bool)
+    receivable[np.arange(NUM_JUDGES), rng.integers(0, len(JURISDICTIONS), NUM_JUDGES)] = True
+    receivable[np.arange(NUM_JUDGES), rng.integers(0, len(JURISDICTIONS), NUM_JUDGES)] = True
+    receivable[rng.random(NUM_JUDGES) < 0.05] = False
+
+    # Zipf-like skew: a few judges carry most of the docket
+    weights = 1.0 / np.arange(1, NUM_JUDGES + 1) ** 0.8
+    case_judge = rng.choice(NUM_JUDGES, size=NUM_CASES, p=weights / weights.sum())
+    case_ids = np.arange(1, NUM_CASES + 1)
+    case_jurisdiction = rng.integers(0, len(JURISDICTIONS), NUM_CASES)
+    case_load = np.ones(NUM_CASES)
+
+    recusals = set(zip(
+        rng.integers(1, NUM_JUDGES + 1, NUM_RECUSALS).tolist(),
+        rng.integers(1, NUM_CASES + 1, NUM_RECUSALS).tolist()
+    ))
+    return judge_ids, receivable, case_ids, case_judge, case_jurisdiction, case_load, recusals
+
+def main():
+    rng = np.random.default_rng(42)
+    judge_ids, receivable, case_ids, case_judge, case_jurisdiction, case_load, recusals = build_court(rng)
+    print(f"Planning up to {MAX_TRANSFERS:,} transfers for {NUM_JUDGES:,} judges and {NUM_CASES:,} active cases")
+
+    t0 = time.perf_counter()
+    moves, before, after = plan_transfers(
+        judge_ids, receivable, case_ids, case_judge, case_jurisdiction, case_load, recusals, MAX_TRANSFERS
+    )
+    elapsed = time.perf_counter() - t0
+
+    violations = sum(
+        1 for case, _, target in moves
+        if not receivable[target, case_jurisdiction[case]] or (judge_ids[target], case_ids[case]) in recusals
+    )
+
+    print(f"  transfers planned:    {len(moves):9,}")
+    print(f"  load std before:      {before.std():9.2f}")
+    print(f"  load std after:       {after.std():9.2f}")
+    print(f"  max load before/after:{before.max():6.0f} / {after.max():.0f}")
+    print(f"  constraint violations:{violations:9}")
+    print(f"  planning time:        {elapsed * 1000:9.1f} ms (budget {TIME_BUDGET_SECONDS * 1000:.0f} ms)")
+
+    if violations or after.var() > before.var() or elapsed > TIME_BUDGET_SECONDS:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
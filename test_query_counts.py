@@ -0,0 +1,139 @@
+"""
+Query-count regression check for the calendar and court views
+Seeds a throwaway SQLite database with a week of 300 hearings across district courts,
+calls the calendar and court endpoints in-process and fails if any of them issues more
+SQL statements than its budget. A lazy load per hearing or a lookup per court shows up
+here as dozens of extra queries.
+
+Run from the project root: python test_query_counts.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import SessionLocal, engine, assert_max_queries
+from models import (
+    Base, Court, Courtroom, User, Judge, Case, Hearing,
+    CourtLevel, Jurisdiction, UserRole, UrgencyLevel, CaseStatus
+)
+from routers import calendar, courts
+from routers.auth import get_current_user
+
+NUM_HEARINGS = 300
+NUM_COURTROOMS = 10
+NUM_JUDGES = 8
+NUM_DISTRICT_COURTS = 25
+
+# Statement budgets per endpoint, independent of the number of hearings
+QUERY_BUDGETS = {
+    "day view": 2,
+    "week view": 1,
+    "upcoming hearings": 1,
+    "courts list": 2,
+    "court statistics": 5,
+}
+
+def seed(monday: date) -> User:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    court = Court(name="High Court", level=CourtLevel.HIGH_COURT, jurisdiction=Jurisdiction.CIVIL, location="Capital")
+    db.add(court)
+    db.flush()
+    db.add_all([
+        Court(name=f"District Court {i + 1}", level=CourtLevel.DISTRICT_COURT, jurisdiction=Jurisdiction.CIVIL,
+              location=f"District {i + 1}", parent_court_id=court.id)
+        for i in range(NUM_DISTRICT_COURTS)
+    ])
+
+    admin = User(email="admin@court.gov", hashed_password="x", full_name="Admin", role=UserRole.CHIEF_JUSTICE, court_id=court.id)
+    db.add(admin)
+
+    courtrooms = [Courtroom(court_id=court.id, name=f"Courtroom {i + 1}", capacity=50) for i in range(NUM_COURTROOMS)]
+    db.add_all(courtrooms)
+
+    judges = []
+    for i in range(NUM_JUDGES):
+        user = User(email=f"judge{i}@court.gov", hashed_password="x", full_name=f"Judge {i}", role=UserRole.PRESIDING_JUDGE, court_id=court.id)
+        db.add(user)
+        db.flush()
+        judges.append(Judge(user_id=user.id, court_id=court.id, specializations=["civil"], experience_years=10))
+    db.add_all(judges)
+    db.flush()
+
+    for i in range(NUM_HEARINGS):
+        case = Case(
+            case_number=f"QC-{i:04d}",
+            title=f"Case {i}",
+            court_id=court.id,
+            jurisdiction=Jurisdiction.CIVIL,
+            case_type="civil",
+            status=CaseStatus.LISTED,
+            urgency_level=UrgencyLevel.REGULAR,
+            complexity_score=5,
+            public_interest_score=5,
+            estimated_duration_hours=1.0,
+            assigned_judge_id=judges[i % NUM_JUDGES].id if i % 10 else None
+        )
+        db.add(case)
+        db.flush()
+        db.add(Hearing(
+            case_id=case.id,
+            courtroom_id=courtrooms[i % NUM_COURTROOMS].id,
+            scheduled_date=datetime.combine(monday + timedelta(days=i % 5), datetime.min.time()).replace(hour=9 + i % 8),
+            scheduled_duration_hours=1.0,
+            status="scheduled"
+        ))
+
+    db.commit()
+    db.refresh(admin)
+    db.expunge(admin)
+    db.close()
+    return admin
+
+def main():
+    next_week = date.today() + timedelta(days=7)
+    monday = next_week - timedelta(days=next_week.weekday())
+    admin = seed(monday)
+
+    app = FastAPI()
+    app.include_router(calendar.router, prefix="/api/calendar")
+    app.include_router(courts.router, prefix="/api/courts")
+    app.dependency_overrides[get_current_user] = lambda: admin
+    client = TestClient(app)
+
+    requests = {
+        "day view": f"/api/calendar/day-view?target_date={monday}",
+        "week view": f"/api/calendar/week-view?week_start={monday}",
+        "upcoming hearings": "/api/calendar/upcoming-hearings?days_ahead=14",
+        "courts list": "/api/courts/",
+        "court statistics": "/api/courts/statistics",
+    }
+
+    failures = 0
+    for name, url in requests.items():
+        budget = QUERY_BUDGETS[name]
+        try:
+            with assert_max_queries(budget) as counter:
+                response = client.get(url)
+            assert response.status_code == 200, f"HTTP {response.status_code}: {response.text}"
+            print(f"✓ {name}: {counter.count} queries (budget {budget})")
+        except AssertionError as error:
+            failures += 1
+            print(f"✗ {name}: {str(error)[:500]}")
+
+    if failures:
+        sys.exit(1)
+    print(f"\nAll views stayed within their query budgets for {NUM_HEARINGS} hearings and {NUM_DISTRICT_COURTS + 1} courts")
+
+if __name__ == "__main__":
+    main()